@@ -0,0 +1,58 @@
+import json
+import os
+import time
+from typing import Any, Optional
+
+
+class ApiCache:
+    """API 동작 특성(페이지 크기, 작동하는 엔드포인트 등)을 디스크에 기억하는 TTL 캐시
+
+    path=None이면 디스크에 쓰지 않는 메모리 전용 캐시 (아카이브 재생 등)
+    """
+
+    DEFAULT_PATH = "api_cache.json"
+
+    def __init__(self, path: Optional[str] = DEFAULT_PATH):
+        self.path = path
+        self._entries = self._load()
+
+    def _load(self) -> dict:
+        """캐시 파일 로드 (없거나 깨졌으면 빈 캐시)"""
+        if self.path is None:
+            return {}
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, "r", encoding="utf-8") as f:
+                    entries = json.load(f)
+                if isinstance(entries, dict):
+                    return entries
+        except Exception as e:
+            print(f"API 캐시 로드 중 오류: {e}")
+        return {}
+
+    def _save(self) -> None:
+        """캐시 파일 저장 - 다른 인스턴스가 쓴 항목을 덮어쓰지 않도록 디스크 내용과 합쳐서 저장"""
+        if self.path is None:
+            return
+        try:
+            merged = self._load()
+            merged.update(self._entries)
+            self._entries = merged
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            print(f"API 캐시 저장 중 오류: {e}")
+
+    def get(self, key: str, ttl: Optional[float] = None) -> Any:
+        """캐시 값 반환 - 없거나 ttl(초)이 지났으면 None"""
+        entry = self._entries.get(key)
+        if not isinstance(entry, dict):
+            return None
+        if ttl is not None and time.time() - entry.get("updated", 0) > ttl:
+            return None
+        return entry.get("value")
+
+    def set(self, key: str, value: Any) -> None:
+        """캐시 값 저장 (갱신 시각 포함)"""
+        self._entries[key] = {"value": value, "updated": time.time()}
+        self._save()
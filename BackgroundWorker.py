@@ -0,0 +1,117 @@
+import asyncio
+import concurrent.futures
+import threading
+from typing import Optional, Dict, Callable, Awaitable, Any
+
+import aiohttp
+
+from GachaAPI import GachaAPI
+
+# 작업 = 인자 없이 호출하면 코루틴을 돌려주는 함수
+Job = Callable[[], Awaitable[Any]]
+
+
+class BackgroundWorker:
+    """앱이 켜져 있는 동안 유지되는 백그라운드 asyncio 루프 하나
+
+    - 작업(동기화, 링크 검증, 메타데이터 갱신)을 큐로 받아 한 번에 하나씩 실행
+    - 같은 종류의 작업이 이미 대기/실행 중이면 새로 넣지 않고 기존 작업의 Future를 돌려줌
+    - HTTP 세션(커넥션 풀)을 루프와 함께 유지해서 다음 조회에서 TLS 연결을 재사용
+    - 일정 간격으로 작업을 자동 등록 (자동 갱신)
+    """
+
+    def __init__(self, name: str = "gacha-worker"):
+        self.name = name
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._thread: Optional[threading.Thread] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._ready = threading.Event()
+        self._pending: Dict[str, concurrent.futures.Future] = {}
+        self._schedules: Dict[str, asyncio.Task] = {}
+
+    def start(self) -> None:
+        """작업자 스레드 시작 (루프와 세션이 준비될 때까지 대기)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    async def _open(self) -> None:
+        # 세션(커넥터)은 실행 중인 루프 안에서 만들어야 함
+        self._queue = asyncio.Queue()
+        self.session = GachaAPI.create_session()
+
+    def _run(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self._open())
+        finally:
+            self._ready.set()
+        consumer = self.loop.create_task(self._consume())
+        try:
+            self.loop.run_forever()
+        finally:
+            consumer.cancel()
+            for task in self._schedules.values():
+                task.cancel()
+            self.loop.run_until_complete(asyncio.gather(consumer, *self._schedules.values(), return_exceptions=True))
+            self.loop.run_until_complete(self.session.close())
+            self.loop.close()
+
+    async def _consume(self) -> None:
+        """큐의 작업을 순서대로 하나씩 실행"""
+        while True:
+            kind, job, future = await self._queue.get()
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(await job())
+                except Exception as e:
+                    print(f"❌ 백그라운드 작업 실패 ({kind}): {e}")
+                    future.set_exception(e)
+            # 실행 중에 같은 종류의 새 작업이 등록됐으면 그 Future는 남겨 둠
+            if self._pending.get(kind) is future:
+                del self._pending[kind]
+
+    def submit(self, kind: str, job: Job) -> concurrent.futures.Future:
+        """작업 등록 (어느 스레드에서든 호출 가능) - 완료를 기다릴 수 있는 Future 반환"""
+        if self.loop is None:
+            raise RuntimeError("백그라운드 작업자가 시작되지 않았습니다")
+        existing = self._pending.get(kind)
+        if existing is not None and not existing.done():
+            return existing
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        self._pending[kind] = future
+        self.loop.call_soon_threadsafe(self._queue.put_nowait, (kind, job, future))
+        return future
+
+    def schedule(self, kind: str, interval: float, job: Job) -> None:
+        """interval(초)마다 작업 자동 등록 - 0 이하면 해당 자동 작업 해제"""
+        if self.loop is None:
+            raise RuntimeError("백그라운드 작업자가 시작되지 않았습니다")
+
+        def apply():
+            previous = self._schedules.pop(kind, None)
+            if previous is not None:
+                previous.cancel()
+            if interval > 0:
+                self._schedules[kind] = self.loop.create_task(self._repeat(kind, interval, job))
+
+        self.loop.call_soon_threadsafe(apply)
+
+    async def _repeat(self, kind: str, interval: float, job: Job) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            print(f"⏰ 자동 작업 등록: {kind} ({interval / 60:.0f}분 간격)")
+            self.submit(kind, job)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """루프 종료 - 세션을 닫고 스레드가 끝날 때까지 잠시 대기"""
+        if self.loop is None or not self.loop.is_running():
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout)
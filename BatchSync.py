@@ -0,0 +1,267 @@
+"""여러 계정(가챠 URL)을 한 번에 동기화하는 배치 모드 - GUI 없이 실행
+
+사용 예:
+    python BatchSync.py urls.txt --out accounts --concurrency 10 --rps 5
+
+urls.txt에는 계정별 가챠 URL(authkey 포함)을 한 줄에 하나씩 적는다.
+계정별 결과는 <out>/<uid>/data.csv, <out>/<uid>/sync_state.json에 따로 저장된다.
+"""
+import argparse
+import asyncio
+import csv
+import json
+import os
+import time
+from collections import Counter
+from typing import List, Dict, Any
+
+from GachaAPI import GachaAPI
+from RateLimiter import RateLimiter
+from ApiCache import ApiCache
+from LinkRegistry import LinkRegistry
+from GachaErrors import GachaAPIError, AuthExpiredError
+
+BANNER_IDS = ["11", "12", "21", "22", "1", "2"]
+CSV_COLUMNS = ["uid", "id", "rarity", "time", "banner", "type", "manual"]
+
+
+class AccountStore:
+    """계정 하나의 출력 저장소 (data.csv + sync_state.json)"""
+
+    def __init__(self, root: str, uid: str):
+        self.uid = uid
+        self.path = os.path.join(root, uid)
+        self.csv_path = os.path.join(self.path, "data.csv")
+        self.state_path = os.path.join(self.path, "sync_state.json")
+
+    def load_state(self) -> Dict[str, Any]:
+        try:
+            if os.path.exists(self.state_path):
+                with open(self.state_path, "r", encoding="utf-8") as f:
+                    state = json.load(f)
+                state.setdefault("high_water", {})
+                return state
+        except Exception as e:
+            print(f"[{self.uid}] 증분 조회 상태 로드 중 오류: {e}")
+        return {"high_water": {}}
+
+    def save_state(self, state: Dict[str, Any]) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        with open(self.state_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+
+    def load_rows(self) -> List[Dict[str, str]]:
+        if not os.path.exists(self.csv_path):
+            return []
+        with open(self.csv_path, "r", encoding="utf-8-sig", newline="") as f:
+            return [dict(row) for row in csv.DictReader(f)]
+
+    def merge_rows(self, new_rows: List[Dict[str, str]]) -> int:
+        """새 행을 기존 data.csv와 병합해서 저장하고 추가된 행 수 반환
+
+        10연차는 같은 시각에 같은 아이템이 여러 번 나올 수 있으므로 키별 개수(멀티셋)로 비교
+        """
+        rows = self.load_rows()
+
+        def row_key(row):
+            return (str(row.get("uid", "")), str(row.get("id", "")), str(row.get("time", "")), str(row.get("banner", "")))
+
+        existing_counts = Counter(row_key(row) for row in rows)
+        new_counts = Counter(row_key(row) for row in new_rows)
+        added = 0
+        for row in new_rows:
+            key = row_key(row)
+            if new_counts[key] > existing_counts[key]:
+                rows.append(row)
+                existing_counts[key] += 1
+                added += 1
+
+        rows.sort(key=lambda r: (r.get("time", ""), r.get("id", "")), reverse=True)
+        os.makedirs(self.path, exist_ok=True)
+        with open(self.csv_path, "w", encoding="utf-8-sig", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(rows)
+        return added
+
+
+class BatchSync:
+    """여러 계정을 동시에 동기화 - 계정별로 독립된 GachaAPI/저장소, 전체 동시 실행 수 제한"""
+
+    def __init__(self, out_dir: str, concurrency: int = 10,
+                 requests_per_second: float = RateLimiter.DEFAULT_REQUESTS_PER_SECOND,
+                 burst: int = RateLimiter.DEFAULT_BURST, lang: str = "ko"):
+        self.out_dir = out_dir
+        self.concurrency = max(1, concurrency)
+        self.lang = lang
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.api_cache = ApiCache(os.path.join(out_dir, "api_cache.json"))
+        self.link_registry = LinkRegistry(os.path.join(out_dir, "link_registry.json"))
+
+    def _known_stores(self) -> Dict[str, AccountStore]:
+        """출력 폴더에 이미 있는 계정 저장소 (폴더 이름 = uid)"""
+        stores = {}
+        if os.path.isdir(self.out_dir):
+            for name in os.listdir(self.out_dir):
+                if os.path.isdir(os.path.join(self.out_dir, name)):
+                    stores[name] = AccountStore(self.out_dir, name)
+        return stores
+
+    def _load_high_water(self) -> Dict[str, Dict[str, str]]:
+        """모든 계정의 high-water mark를 {banner_id: {uid: id}}로 합침
+
+        URL만으로는 uid를 알 수 없지만, 페이저가 기록의 uid별로 mark를 비교하므로 합쳐서 넘겨도 안전
+        """
+        merged: Dict[str, Dict[str, str]] = {}
+        for uid, store in self._known_stores().items():
+            if not os.path.exists(store.csv_path):
+                continue
+            for banner_id, marks in store.load_state().get("high_water", {}).items():
+                if uid in marks:
+                    merged.setdefault(banner_id, {})[uid] = marks[uid]
+        return merged
+
+    @staticmethod
+    def _to_row(record: Dict[str, Any], banner_id: str) -> Dict[str, str]:
+        """API 원본 기록 → data.csv 행 (GUI의 save_data_to_file과 같은 컬럼)"""
+        return {
+            "uid": str(record.get("uid", "")),
+            "id": str(record.get("item_id") or record.get("itemId") or record.get("id") or ""),
+            "rarity": str(record.get("rank_type", "3")),
+            "time": record.get("time", ""),
+            "banner": banner_id,
+            "type": str(record.get("gacha_type", "")),
+            "manual": "False",
+        }
+
+    async def sync_account(self, label: str, gacha_url: str, rate_limiter: RateLimiter,
+                           high_water: Dict[str, Dict[str, str]]) -> Dict[str, Any]:
+        """계정 하나 동기화 - 실패해도 다른 계정에 영향 없음"""
+        result = {"label": label, "uids": [], "added": 0, "fetched": 0, "complete": False, "error": None, "wall": 0.0}
+        started = time.perf_counter()
+        rows_by_uid: Dict[str, List[Dict[str, str]]] = {}
+        newest: Dict[str, Dict[str, str]] = {}
+
+        try:
+            if self.link_registry.is_known_expired(gacha_url):
+                raise RuntimeError("이미 인증키 만료(-101)로 확인된 링크")
+            self.link_registry.touch(gacha_url)
+
+            async with GachaAPI(gacha_url, rate_limiter=rate_limiter, api_cache=self.api_cache) as api:
+                is_valid = await api.validate_link(self.lang)
+                retcode = api.determined_retcode(api.validation_result)
+                if retcode is not None:
+                    self.link_registry.record_validation(gacha_url, is_valid, retcode)
+                if not is_valid:
+                    raise RuntimeError("링크 검증 실패 (인증키 만료 또는 잘못된 링크)")
+
+                async def fetch_one(banner_id: str):
+                    try:
+                        async for page in api.iter_pages(banner_id, self.lang, high_water=high_water.get(banner_id)):
+                            for record in page:
+                                uid = str(record.get("uid", ""))
+                                rows_by_uid.setdefault(uid, []).append(self._to_row(record, banner_id))
+                                marks = newest.setdefault(uid, {})
+                                if GachaAPI.record_id_value(record.get("id")) > GachaAPI.record_id_value(marks.get(banner_id)):
+                                    marks[banner_id] = str(record.get("id"))
+                            result["fetched"] += len(page)
+                    except AuthExpiredError:
+                        raise
+                    except GachaAPIError as e:
+                        # 받은 만큼은 저장하고, 끊긴 배너는 mark를 올리지 않음 (fetch_status로 판단)
+                        print(f"⚠️ [{label}] 배너 {banner_id} 조회 중단: {e}")
+
+                tasks = [asyncio.ensure_future(fetch_one(banner_id)) for banner_id in BANNER_IDS]
+                try:
+                    await asyncio.gather(*tasks)
+                except AuthExpiredError:
+                    # 만료된 키로 다른 배너를 계속 넘기지 않음 - 받은 기록만 저장하고 계정 실패로 처리
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+                    self.link_registry.record_validation(gacha_url, False, AuthExpiredError.RETCODE)
+                    result["error"] = "조회 중 인증키 만료(-101)"
+                complete_banners = {b for b in BANNER_IDS if api.fetch_status.get(b, {}).get("complete")}
+                result["complete"] = len(complete_banners) == len(BANNER_IDS)
+
+            for uid, rows in rows_by_uid.items():
+                store = AccountStore(self.out_dir, uid)
+                result["added"] += store.merge_rows(rows)
+                # 끝까지 조회된 배너만 mark를 올림 (끊긴 구간이 다음 조회에서 채워지도록)
+                state = store.load_state()
+                for banner_id, record_id in newest.get(uid, {}).items():
+                    if banner_id in complete_banners:
+                        marks = state["high_water"].setdefault(banner_id, {})
+                        if GachaAPI.record_id_value(record_id) > GachaAPI.record_id_value(marks.get(uid)):
+                            marks[uid] = record_id
+                store.save_state(state)
+            result["uids"] = sorted(rows_by_uid)
+            if result["error"]:
+                print(f"❌ [{label}] 동기화 실패: {result['error']}")
+        except Exception as e:
+            result["error"] = str(e)
+            print(f"❌ [{label}] 동기화 실패: {e}")
+
+        result["wall"] = time.perf_counter() - started
+        return result
+
+    async def run(self, gacha_urls: List[str]) -> List[Dict[str, Any]]:
+        """모든 계정을 동시 실행 수 제한 안에서 동기화하고 요약 저장"""
+        os.makedirs(self.out_dir, exist_ok=True)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        # 같은 호스트로 가는 요청 전체의 속도는 하나의 토큰 버킷으로 제한
+        rate_limiter = RateLimiter(self.requests_per_second, self.burst)
+        high_water = self._load_high_water()
+        started = time.perf_counter()
+
+        async def run_one(index: int, gacha_url: str):
+            async with semaphore:
+                label = f"account-{index + 1}"
+                print(f"🔄 [{label}] 동기화 시작")
+                result = await self.sync_account(label, gacha_url, rate_limiter, high_water)
+                status = "✅" if result["complete"] else "⚠️" if not result["error"] else "❌"
+                print(f"{status} [{label}] uid={','.join(result['uids']) or '-'} 신규 {result['added']}개 ({result['wall']:.1f}초)")
+                return result
+
+        results = await asyncio.gather(*(run_one(i, url) for i, url in enumerate(gacha_urls)))
+        wall = time.perf_counter() - started
+
+        summary = {
+            "accounts": len(results),
+            "succeeded": sum(1 for r in results if not r["error"]),
+            "complete": sum(1 for r in results if r["complete"]),
+            "added": sum(r["added"] for r in results),
+            "wall": wall,
+            "requests": rate_limiter.acquired,
+            "results": results,
+        }
+        with open(os.path.join(self.out_dir, "batch_summary.json"), "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"\n📦 배치 완료: {summary['succeeded']}/{summary['accounts']}개 계정 성공, 신규 {summary['added']}개, {wall:.1f}초, 요청 {summary['requests']}회")
+        return results
+
+
+def read_url_list(path: str) -> List[str]:
+    """URL 목록 파일 읽기 (빈 줄, # 주석 무시, 중복 제거)"""
+    urls = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#") and line not in urls:
+                urls.append(line)
+    return urls
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="여러 계정 가챠 기록 일괄 동기화")
+    parser.add_argument("url_file", help="계정별 가챠 URL이 한 줄에 하나씩 있는 파일")
+    parser.add_argument("--out", default="accounts", help="계정별 결과를 저장할 폴더")
+    parser.add_argument("--concurrency", type=int, default=10, help="동시에 동기화할 최대 계정 수")
+    parser.add_argument("--rps", type=float, default=RateLimiter.DEFAULT_REQUESTS_PER_SECOND, help="전체 초당 요청 수")
+    parser.add_argument("--burst", type=int, default=RateLimiter.DEFAULT_BURST, help="버스트 크기")
+    parser.add_argument("--lang", default="ko", help="API 요청 언어")
+    args = parser.parse_args()
+
+    batch = BatchSync(args.out, concurrency=args.concurrency, requests_per_second=args.rps, burst=args.burst, lang=args.lang)
+    asyncio.run(batch.run(read_url_list(args.url_file)))
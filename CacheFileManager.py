@@ -1,26 +1,21 @@
-import customtkinter as ctk
-from tkinter import messagebox
-import asyncio
-import threading
-import aiohttp
-import json
 import os
-import sys
-import warnings
 import subprocess
 import re
-import winreg
 import tempfile
 import shutil
-from typing import Optional, List, Dict, Any, Tuple
-from urllib.parse import urlparse, parse_qs
-from collections import OrderedDict
-import time
+import mmap
+from typing import Optional, List, Tuple
 from GachaLinkFinder import GachaLinkFinder
+from ChromiumCacheParser import find_gacha_entries
 
 class CacheFileManager:
     """게임 캐시 파일 관리 클래스"""
     
+    # 캐시 항목 키(URL)에서 찾을 고정 문자열 - getLdGachaLog는 getGachaLog를 포함하지 않으므로 따로 찾음
+    CACHE_LINK_ANCHORS = (b"getGachaLog", b"getLdGachaLog")
+    # 링크 시작(https://)부터 getGachaLog까지, getGachaLog부터 링크 끝까지 볼 최대 길이
+    MAX_CACHE_URL_SPAN = 8 * 1024
+    
     @staticmethod
     def find_game_path() -> Optional[str]:
         """로그에서 게임 경로 찾기"""
@@ -50,33 +45,125 @@ class CacheFileManager:
         return None
     
     @staticmethod
-    def find_cache_path(game_path: str) -> Optional[str]:
-        """최신 캐시 경로 찾기"""
+    def find_cache_paths(game_path: str) -> List[str]:
+        """모든 버전 폴더의 캐시 파일(data_2) 경로 (높은 버전부터, 버전 없는 기본 폴더는 마지막)
+        
+        simple 형식 캐시는 data_2가 없으므로 Cache_Data 폴더가 있으면 포함한다.
+        """
         cache_base = os.path.join(game_path, "webCaches")
         if not os.path.exists(cache_base):
-            return None
-        
-        cache_path = os.path.join(cache_base, "Cache", "Cache_Data", "data_2")
-        max_version = 0
+            return []
         
+        versioned = []
         try:
             for folder_name in os.listdir(cache_base):
-                folder_path = os.path.join(cache_base, folder_name)
-                if not os.path.isdir(folder_path):
-                    continue
-                    
                 if re.match(r'^\d+\.\d+\.\d+\.\d+$', folder_name):
-                    try:
-                        version_num = int(folder_name.replace('.', ''))
-                        if version_num >= max_version:
-                            max_version = version_num
-                            cache_path = os.path.join(cache_base, folder_name, "Cache", "Cache_Data", "data_2")
-                    except ValueError:
-                        continue
+                    cache_path = os.path.join(cache_base, folder_name, "Cache", "Cache_Data", "data_2")
+                    if os.path.isdir(os.path.dirname(cache_path)):
+                        versioned.append((tuple(int(part) for part in folder_name.split('.')), cache_path))
         except Exception as e:
             print(f"버전 폴더 확인 실패: {e}")
         
-        return cache_path if os.path.exists(cache_path) else None
+        paths = [cache_path for _, cache_path in sorted(versioned, reverse=True)]
+        default_path = os.path.join(cache_base, "Cache", "Cache_Data", "data_2")
+        if os.path.isdir(os.path.dirname(default_path)):
+            paths.append(default_path)
+        return paths
+    
+    @classmethod
+    def scan_cache_links(cls, cache_path: str, limit: Optional[int] = None) -> List[str]:
+        """캐시 파일을 메모리 매핑해서 끝에서부터 rfind로 가챠 링크 검색 (최신 항목부터, authkey 기준 중복 제거)
+        
+        파일을 통째로 읽거나 디코딩하지 않고 찾은 URL 부분만 디코딩한다. limit개를 찾으면 바로 멈춘다.
+        """
+        url_body = GachaLinkFinder.GACHA_URL_BODY[bytes]
+        links = []
+        seen = set()
+        
+        with open(cache_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                pos = len(data)
+                # 고정 문자열별로 마지막으로 찾은 위치 - 아직 pos 앞에 있으면 다시 찾지 않음
+                found = {anchor: len(data) for anchor in cls.CACHE_LINK_ANCHORS}
+                while pos > 0:
+                    for anchor in cls.CACHE_LINK_ANCHORS:
+                        if found[anchor] >= pos:
+                            found[anchor] = data.rfind(anchor, 0, pos)
+                    anchor, anchor_pos = max(found.items(), key=lambda item: item[1])
+                    if anchor_pos < 0:
+                        break
+                    
+                    start = data.rfind(b'https://', max(0, anchor_pos - cls.MAX_CACHE_URL_SPAN), anchor_pos)
+                    if start < 0:
+                        pos = anchor_pos
+                        continue
+                    # 캐시 키는 NUL로 끝나므로 URL 끝 검색은 NUL 앞에서 멈춤
+                    limit_end = data.find(b'\0', anchor_pos, anchor_pos + cls.MAX_CACHE_URL_SPAN)
+                    if limit_end < 0:
+                        limit_end = min(len(data), anchor_pos + cls.MAX_CACHE_URL_SPAN)
+                    match = url_body.match(data, start, limit_end)
+                    pos = start
+                    if match.end() < anchor_pos + len(anchor):
+                        # https://와 getGachaLog 사이가 끊겨 있으면 같은 URL이 아님
+                        continue
+                    
+                    link = match.group(0).decode('utf-8', errors='ignore')
+                    authkey = GachaLinkFinder.authkey_of(link) or link
+                    if authkey in seen:
+                        continue
+                    seen.add(authkey)
+                    links.append(link)
+                    if limit and len(links) >= limit:
+                        break
+        return links
+    
+    @classmethod
+    def read_cache_links(cls, cache_path: str, limit: Optional[int] = None) -> List[str]:
+        """scan_cache_links + 게임이 파일을 잠그고 있으면 임시 복사본에서 스캔"""
+        try:
+            return cls.scan_cache_links(cache_path, limit)
+        except PermissionError:
+            print("❌ 권한 부족 - 임시 복사 시도")
+            temp_path = cls.copy_cache_file(cache_path)
+            if not temp_path:
+                print("❌ 모든 복사 방법 실패")
+                return []
+            try:
+                links = cls.scan_cache_links(temp_path, limit)
+                print(f"✅ 복사본에서 읽기 성공: {os.path.getsize(temp_path):,} bytes")
+                return links
+            except Exception as e:
+                print(f"❌ 복사본 읽기 실패: {e}")
+                return []
+            finally:
+                try:
+                    os.unlink(temp_path)
+                except:
+                    pass
+        except Exception as e:
+            print(f"❌ 캐시 분석 실패: {e}")
+            return []
+    
+    @classmethod
+    def find_cache_links(cls, cache_path: str, limit: Optional[int] = None) -> List[Tuple[float, str]]:
+        """캐시 폴더의 가챠 링크를 (마지막 사용 시각, 링크) 최신순으로
+        
+        index/랭킹 노드를 해석하는 ChromiumCacheParser를 먼저 쓰고, 해석에 실패하거나 찾지 못하면
+        data_2를 직접 검색한다 (이때 시각은 data_2 수정 시각).
+        """
+        try:
+            entries = find_gacha_entries(os.path.dirname(cache_path), limit or GachaLinkFinder.MAX_LOG_CANDIDATES)
+            if entries:
+                return [(entry["last_used"], entry["url"]) for entry in entries]
+        except Exception as e:
+            print(f"⚠️ 캐시 index 해석 실패 - data_2 직접 검색: {e}")
+        
+        if not os.path.exists(cache_path):
+            return []
+        mtime = os.path.getmtime(cache_path)
+        return [(mtime, link) for link in cls.read_cache_links(cache_path, limit)]
     
     @staticmethod
     def copy_cache_file(cache_path: str) -> Optional[str]:
@@ -137,73 +224,11 @@ class CacheFileManager:
             print(f"캐시 파일 복사 실패: {e}")
             return None
 
-def get_gacha_link_from_game_cache() -> Optional[str]:
-    """게임 웹캐시에서 가챠 링크 추출"""
-    manager = CacheFileManager()
-    
-    # 게임 경로 찾기
-    game_path = manager.find_game_path()
-    if not game_path:
-        print("❌ 게임 경로를 찾을 수 없습니다")
-        return None
-    
-    # 캐시 경로 찾기
-    cache_path = manager.find_cache_path(game_path)
-    if not cache_path:
-        print("❌ 캐시 파일을 찾을 수 없습니다")
-        return None
-    
-    print(f"캐시 파일 분석: {cache_path}")
-    
-    # 캐시 파일 읽기
-    cache_data = None
-    temp_path = None
-    
+def get_gacha_link_candidates_from_cache(cache_path: str) -> List[Tuple[float, str]]:
+    """캐시 폴더 하나에서 (시각, 링크) 후보 추출 - 시각은 링크의 timestamp 파라미터, 없으면 캐시 항목의 마지막 사용 시각"""
     try:
-        with open(cache_path, 'rb') as f:
-            cache_data = f.read()
-    except PermissionError:
-        print("❌ 권한 부족 - 임시 복사 시도")
-        temp_path = manager.copy_cache_file(cache_path)
-        if temp_path:
-            try:
-                with open(temp_path, 'rb') as f:
-                    cache_data = f.read()
-                print(f"✅ 복사본에서 읽기 성공: {len(cache_data):,} bytes")
-            except Exception as e:
-                print(f"❌ 복사본 읽기 실패: {e}")
-        else:
-            print("❌ 모든 복사 방법 실패")
-            return None
-    except Exception as e:
-        print(f"❌ 캐시 파일 읽기 실패: {e}")
-        return None
-    finally:
-        if temp_path and os.path.exists(temp_path):
-            try:
-                os.unlink(temp_path)
-            except:
-                pass
-    
-    if not cache_data:
-        return None
-    
-    # 캐시 데이터 분석
-    try:
-        cache_text = cache_data.decode('utf-8', errors='ignore')
-        cache_parts = cache_text.split('1/0/')
-        
-        # 역순으로 검색 (최신 데이터부터)
-        for part in reversed(cache_parts):
-            if part and part.startswith('http') and ('getGachaLog' in part or 'getLdGachaLog' in part):
-                url = part.split('\0')[0]
-                if url and len(url.strip()) > 0:
-                    print(f"✅ 캐시에서 URL 발견: {url[:100]}...")
-                    return url
-        
-        print("❌ 캐시에서 가챠 URL을 찾을 수 없습니다")
-        return None
-        
-    except Exception as e:
-        print(f"❌ 캐시 분석 실패: {e}")
-        return None
\ No newline at end of file
+        found = CacheFileManager.find_cache_links(cache_path)
+    except OSError as e:
+        print(f"❌ 캐시 읽기 실패: {e}")
+        return []
+    return [(GachaLinkFinder.link_timestamp(link, last_used), link) for last_used, link in found]
@@ -0,0 +1,283 @@
+"""게임 내장 브라우저(webCaches/<버전>/Cache/Cache_Data)의 Chromium 디스크 캐시 파서
+
+blockfile 형식 (index + data_0~data_3 + f_xxxxxx):
+    index   : 368바이트 헤더(magic 0xC103CAC3, table_len, LRU 리스트) + CacheAddr 해시 테이블
+    data_N  : 8192바이트 헤더(magic 0xC104CAC3) + 고정 크기 블록 (data_0: 36바이트 랭킹 노드, data_1: 256바이트 항목)
+    f_xxxxxx: 블록에 담기지 않는 큰 데이터 (긴 키 등)
+simple 형식 (<16진수 해시>_0 파일마다 항목 하나)은 헤더의 키만 읽는 대체 경로로 지원한다.
+
+사용 예:
+    python ChromiumCacheParser.py "<게임 경로>/webCaches/2.3.0.0/Cache/Cache_Data"
+"""
+import argparse
+import os
+import re
+import struct
+from typing import Optional, List, Dict, Any, Callable, Iterator, Tuple
+
+from GachaLinkFinder import GachaLinkFinder
+
+INDEX_MAGIC = 0xC103CAC3
+BLOCK_MAGIC = 0xC104CAC3
+INDEX_HEADER_SIZE = 368
+INDEX_TABLE_LEN_OFFSET = 28
+INDEX_LRU_OFFSET = 256
+# LruData: pad1[2], filled, sizes[5] 다음에 heads[5]
+LRU_HEADS_OFFSET = INDEX_LRU_OFFSET + 32
+LRU_LIST_COUNT = 5
+# NO_USE, LOW_USE, HIGH_USE 리스트만 살아 있는 항목 (RESERVED, DELETED 제외)
+LRU_LIVE_LISTS = 3
+DEFAULT_TABLE_LEN = 0x10000
+BLOCK_HEADER_SIZE = 8192
+
+# CacheAddr 비트 구성
+ADDR_INITIALIZED = 0x80000000
+ADDR_FILE_TYPE_MASK = 0x70000000
+ADDR_FILE_TYPE_SHIFT = 28
+ADDR_EXTERNAL_FILE_MASK = 0x0FFFFFFF
+ADDR_NUM_BLOCKS_MASK = 0x03000000
+ADDR_NUM_BLOCKS_SHIFT = 24
+ADDR_FILE_SELECTOR_MASK = 0x00FF0000
+ADDR_FILE_SELECTOR_SHIFT = 16
+ADDR_START_BLOCK_MASK = 0x0000FFFF
+FILE_TYPE_EXTERNAL = 0
+# 파일 종류별 블록 크기 (RANKINGS, BLOCK_256, BLOCK_1K, BLOCK_4K)
+BLOCK_SIZES = {1: 36, 2: 256, 3: 1024, 4: 4096}
+
+# EntryStore / RankingsNode 필드 위치
+# next(4), rankings_node(8)은 연속된 두 CacheAddr
+ENTRY_NEXT_OFFSET = 4
+ENTRY_STATE_OFFSET = 20
+ENTRY_CREATION_TIME_OFFSET = 24
+ENTRY_KEY_LEN_OFFSET = 32
+ENTRY_LONG_KEY_OFFSET = 36
+ENTRY_KEY_OFFSET = 96
+RANKINGS_NEXT_OFFSET = 16
+RANKINGS_CONTENTS_OFFSET = 24
+# EntryStore.state - 새 eviction 방식에서 지워진 항목(EVICTED)도 해시 테이블에는 남아 있음
+ENTRY_NORMAL = 0
+
+SIMPLE_MAGIC = 0xFCFB6D1BA7725C30
+SIMPLE_HEADER_SIZE = 24
+SIMPLE_ENTRY_NAME = re.compile(r'^[0-9a-f]{16}_0$')
+
+# base::Time 내부 값(1601-01-01부터 마이크로초) → 유닉스 시각
+WINDOWS_EPOCH_OFFSET = 11644473600
+
+
+def chromium_time_to_unix(value: int) -> float:
+    return value / 1e6 - WINDOWS_EPOCH_OFFSET if value else 0.0
+
+
+def is_gacha_key(key: str) -> bool:
+    return "getGachaLog" in key or "getLdGachaLog" in key
+
+
+class ChromiumCacheParser:
+    """Chromium blockfile 캐시를 index의 해시 테이블과 LRU 리스트로 따라가며 읽는 파서
+
+    항목은 {"key", "last_used", "created", "state", "address", "next"} 딕셔너리로 반환한다 (시각은 유닉스 시각).
+    파일 형식이 맞지 않으면 ValueError.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self._files: Dict[str, Any] = {}
+        with open(os.path.join(cache_dir, "index"), "rb") as f:
+            header = f.read(INDEX_HEADER_SIZE)
+        if len(header) < INDEX_HEADER_SIZE or struct.unpack_from("<I", header, 0)[0] != INDEX_MAGIC:
+            raise ValueError(f"Chromium 캐시 index가 아닙니다: {cache_dir}")
+        self.num_entries = struct.unpack_from("<i", header, 8)[0]
+        self.table_len = struct.unpack_from("<i", header, INDEX_TABLE_LEN_OFFSET)[0] or DEFAULT_TABLE_LEN
+        self.lru_heads = list(struct.unpack_from(f"<{LRU_LIST_COUNT}I", header, LRU_HEADS_OFFSET))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self) -> None:
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+
+    @staticmethod
+    def parse_addr(addr: int) -> Optional[Tuple[int, int, int, int]]:
+        """CacheAddr → (파일 종류, 파일 번호, 시작 블록, 블록 수) - 초기화되지 않은 주소면 None"""
+        if not addr & ADDR_INITIALIZED:
+            return None
+        file_type = (addr & ADDR_FILE_TYPE_MASK) >> ADDR_FILE_TYPE_SHIFT
+        if file_type == FILE_TYPE_EXTERNAL:
+            return file_type, addr & ADDR_EXTERNAL_FILE_MASK, 0, 0
+        return (file_type,
+                (addr & ADDR_FILE_SELECTOR_MASK) >> ADDR_FILE_SELECTOR_SHIFT,
+                addr & ADDR_START_BLOCK_MASK,
+                ((addr & ADDR_NUM_BLOCKS_MASK) >> ADDR_NUM_BLOCKS_SHIFT) + 1)
+
+    def _open(self, name: str, magic: Optional[int] = None):
+        f = self._files.get(name)
+        if f is None:
+            f = open(os.path.join(self.cache_dir, name), "rb")
+            if magic is not None and struct.unpack("<I", f.read(4))[0] != magic:
+                f.close()
+                raise ValueError(f"블록 파일 형식 오류: {name}")
+            self._files[name] = f
+        return f
+
+    def read_block(self, addr: int) -> bytes:
+        """CacheAddr가 가리키는 블록(또는 외부 파일) 내용"""
+        parsed = self.parse_addr(addr)
+        if parsed is None:
+            raise ValueError(f"초기화되지 않은 주소: {addr:#010x}")
+        file_type, file_number, start_block, num_blocks = parsed
+        if file_type == FILE_TYPE_EXTERNAL:
+            f = self._open(f"f_{file_number:06x}")
+            f.seek(0)
+            return f.read()
+        block_size = BLOCK_SIZES.get(file_type)
+        if block_size is None:
+            raise ValueError(f"지원하지 않는 블록 종류: {file_type}")
+        f = self._open(f"data_{file_number}", BLOCK_MAGIC)
+        f.seek(BLOCK_HEADER_SIZE + start_block * block_size)
+        return f.read(num_blocks * block_size)
+
+    def read_entry(self, addr: int) -> Dict[str, Any]:
+        """EntryStore 하나 읽기 (키 + 랭킹 노드의 마지막 사용 시각)"""
+        data = self.read_block(addr)
+        next_addr, rankings_addr = struct.unpack_from("<II", data, ENTRY_NEXT_OFFSET)
+        state, = struct.unpack_from("<i", data, ENTRY_STATE_OFFSET)
+        creation_time, = struct.unpack_from("<Q", data, ENTRY_CREATION_TIME_OFFSET)
+        key_len, long_key = struct.unpack_from("<iI", data, ENTRY_KEY_LEN_OFFSET)
+        if long_key:
+            key = self.read_block(long_key)[:key_len]
+        else:
+            key = data[ENTRY_KEY_OFFSET:ENTRY_KEY_OFFSET + key_len]
+
+        last_used = 0
+        if rankings_addr:
+            last_used, = struct.unpack_from("<Q", self.read_block(rankings_addr), 0)
+        return {
+            "key": key.decode("utf-8", errors="ignore"),
+            "last_used": chromium_time_to_unix(last_used),
+            "created": chromium_time_to_unix(creation_time),
+            "state": state,
+            "address": addr,
+            "next": next_addr,
+        }
+
+    def iter_entries(self) -> Iterator[Dict[str, Any]]:
+        """index 해시 테이블의 모든 항목 (같은 버킷은 EntryStore.next로 연결)"""
+        with open(os.path.join(self.cache_dir, "index"), "rb") as f:
+            f.seek(INDEX_HEADER_SIZE)
+            table = f.read(self.table_len * 4)
+        for bucket in struct.unpack(f"<{len(table) // 4}I", table):
+            addr = bucket
+            visited = set()
+            while addr and addr not in visited:
+                visited.add(addr)
+                entry = self.read_entry(addr)
+                yield entry
+                addr = entry["next"]
+
+    def iter_recent(self, list_index: int) -> Iterator[Dict[str, Any]]:
+        """LRU 리스트 하나를 최근 사용한 항목부터 순서대로 (head에서 RankingsNode.next를 따라감)"""
+        addr = self.lru_heads[list_index]
+        visited = set()
+        # 손상된 캐시에서 순환하지 않도록 항목 수만큼만 따라감
+        while addr and addr not in visited and len(visited) <= self.num_entries:
+            visited.add(addr)
+            node = self.read_block(addr)
+            contents, = struct.unpack_from("<I", node, RANKINGS_CONTENTS_OFFSET)
+            if contents:
+                yield self.read_entry(contents)
+            addr, = struct.unpack_from("<I", node, RANKINGS_NEXT_OFFSET)
+
+    def find_recent(self, predicate: Callable[[str], bool], limit: int = 1) -> List[Dict[str, Any]]:
+        """조건에 맞는 항목을 마지막 사용 시각 최신순으로 최대 limit개
+
+        LRU 리스트마다 head부터 조건에 맞는 항목 limit개를 찾으면 멈추므로 전체 항목을 읽지 않는다.
+        """
+        found = []
+        for list_index in range(LRU_LIVE_LISTS):
+            matched = 0
+            for entry in self.iter_recent(list_index):
+                if predicate(entry["key"]):
+                    found.append(entry)
+                    matched += 1
+                    if matched >= limit:
+                        break
+        found.sort(key=lambda entry: (entry["last_used"], entry["created"]), reverse=True)
+        return found[:limit]
+
+
+def iter_simple_entries(cache_dir: str) -> Iterator[Dict[str, Any]]:
+    """simple 형식 캐시의 항목 (파일 헤더의 키만 읽음, 마지막 사용 시각은 파일 수정 시각)"""
+    for name in os.listdir(cache_dir):
+        if not SIMPLE_ENTRY_NAME.match(name):
+            continue
+        path = os.path.join(cache_dir, name)
+        try:
+            with open(path, "rb") as f:
+                header = f.read(SIMPLE_HEADER_SIZE)
+                if len(header) < SIMPLE_HEADER_SIZE:
+                    continue
+                magic, _version, key_len, _key_hash = struct.unpack_from("<QIII", header, 0)
+                if magic != SIMPLE_MAGIC:
+                    continue
+                key = f.read(key_len)
+            yield {
+                "key": key.decode("utf-8", errors="ignore"),
+                "last_used": os.path.getmtime(path),
+                "created": 0.0,
+                "state": ENTRY_NORMAL,
+                "address": name,
+                "next": 0,
+            }
+        except OSError:
+            continue
+
+
+def find_gacha_entries(cache_dir: str, limit: int = 5) -> List[Dict[str, Any]]:
+    """캐시 폴더에서 가챠 링크가 키인 항목을 마지막 사용 시각 최신순으로 (authkey 기준 중복 제거)
+
+    blockfile 형식이면 LRU 리스트를 따라가고 (LRU 리스트가 비어 있으면 해시 테이블 전체), index가 없으면 simple 형식으로 읽는다.
+    """
+    if os.path.exists(os.path.join(cache_dir, "index")):
+        with ChromiumCacheParser(cache_dir) as parser:
+            # 같은 authkey의 항목이 여러 개일 수 있으므로 넉넉히 찾은 뒤 중복 제거
+            entries = parser.find_recent(is_gacha_key, limit * 4)
+            if not any(parser.lru_heads[:LRU_LIVE_LISTS]) and parser.num_entries > 0:
+                # 항목은 있는데 LRU 리스트 head가 비어 있으면 (비정상 종료 후 등) 해시 테이블 전체를 훑음
+                entries = sorted((entry for entry in parser.iter_entries()
+                                  if entry["state"] == ENTRY_NORMAL and is_gacha_key(entry["key"])),
+                                 key=lambda entry: (entry["last_used"], entry["created"]), reverse=True)
+    else:
+        entries = sorted((entry for entry in iter_simple_entries(cache_dir) if is_gacha_key(entry["key"])),
+                         key=lambda entry: entry["last_used"], reverse=True)
+
+    unique = []
+    seen = set()
+    for entry in entries:
+        # 키는 "1/0/_dk_<사이트> <사이트> <URL>" 형식일 수 있으므로 마지막 URL을 사용
+        links = [link for _, link in GachaLinkFinder.iter_gacha_links(entry["key"])]
+        if not links:
+            continue
+        link = links[-1]
+        authkey = GachaLinkFinder.authkey_of(link) or link
+        if authkey in seen:
+            continue
+        seen.add(authkey)
+        unique.append({**entry, "url": link})
+        if len(unique) >= limit:
+            break
+    return unique
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chromium 디스크 캐시에서 가챠 링크 항목 조회")
+    parser.add_argument("cache_dir", help="webCaches/<버전>/Cache/Cache_Data 경로")
+    parser.add_argument("--limit", type=int, default=5, help="표시할 최대 항목 수")
+    args = parser.parse_args()
+    for entry in find_gacha_entries(args.cache_dir, args.limit):
+        print(f"{entry['last_used']:.0f}  {entry['url']}")
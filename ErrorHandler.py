@@ -1,10 +1,37 @@
+from typing import Union
+
+from GachaErrors import AuthExpiredError, RateLimitedError, BadParamsError, TransportError
+
+
 class ErrorHandler:
     """에러 처리 및 메시지 관리"""
     
     @staticmethod
-    def get_detailed_error_message(error_msg: str) -> str:
-        """에러 메시지에 따른 상세 안내"""
-        if "Check if the link is correct" in error_msg or "가챠 링크 없음" in error_msg:
+    def get_detailed_error_message(error: Union[str, Exception]) -> str:
+        """에러에 따른 상세 안내 - 가챠 API 예외는 타입으로, 그 외에는 메시지 내용으로 구분"""
+        error_msg = str(error)
+        if isinstance(error, AuthExpiredError):
+            kind = "auth_expired"
+        elif isinstance(error, BadParamsError):
+            kind = "bad_params"
+        elif isinstance(error, RateLimitedError):
+            kind = "rate_limited"
+        elif isinstance(error, TransportError):
+            kind = "timeout"
+        elif "Check if the link is correct" in error_msg or "가챠 링크 없음" in error_msg:
+            kind = "no_link"
+        elif "'NoneType' object has no attribute 'get'" in error_msg:
+            kind = "bad_response"
+        elif "-111" in error_msg or "game name error" in error_msg.lower():
+            kind = "bad_params"
+        elif "-101" in error_msg or "authkey" in error_msg.lower():
+            kind = "auth_expired"
+        elif "timeout" in error_msg.lower():
+            kind = "timeout"
+        else:
+            kind = None
+        
+        if kind == "no_link":
             return """❌ 가챠 링크를 찾을 수 없습니다!
 
 🔧 해결 방법:
@@ -18,7 +45,7 @@ class ErrorHandler:
 • 프로그램을 관리자 권한으로 실행
 • 게임 재시작 후 가챠 기록 재확인"""
 
-        elif "'NoneType' object has no attribute 'get'" in error_msg:
+        elif kind == "bad_response":
             return """❌ API 응답 오류!
 
 🔧 해결 방법:
@@ -27,7 +54,7 @@ class ErrorHandler:
 3. 몇 분 기다린 후 다시 시도하세요
 4. 인터넷 연결을 확인하세요"""
 
-        elif "-111" in error_msg or "game name error" in error_msg.lower():
+        elif kind == "bad_params":
             return """❌ 가챠 링크 파라미터 오류!
 
 🔧 해결 방법:
@@ -36,7 +63,7 @@ class ErrorHandler:
 3. 브라우저 캐시를 삭제하세요
 4. 몇 분 기다린 후 다시 시도하세요"""
 
-        elif "-101" in error_msg or "authkey" in error_msg.lower():
+        elif kind == "auth_expired":
             return """❌ 인증 키 만료!
 
 🔧 해결 방법:
@@ -44,7 +71,14 @@ class ErrorHandler:
 2. 가챠 기록을 새로 열어보세요
 3. 잠시 기다린 후 다시 시도하세요"""
 
-        elif "timeout" in error_msg.lower():
+        elif kind == "rate_limited":
+            return """❌ 요청이 너무 많습니다!
+
+🔧 해결 방법:
+1. 1~2분 기다린 후 다시 시도하세요
+2. settings.json의 requests_per_second 값을 낮추세요"""
+
+        elif kind == "timeout":
             return """❌ 연결 시간 초과!
 
 🔧 해결 방법:
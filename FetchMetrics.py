@@ -0,0 +1,78 @@
+import json
+import math
+import time
+from collections import Counter
+from typing import Optional, List, Dict, Any
+
+
+class FetchMetrics:
+    """조회 파이프라인 요청별 계측 - 요청마다 구조화된 이벤트를 남기고 실행 단위 요약 생성"""
+
+    def __init__(self):
+        self.events: List[Dict[str, Any]] = []
+        self.started = time.time()
+
+    def record(self, **event: Any) -> None:
+        """요청 이벤트 기록
+
+        주요 필드: gacha_type, page, endpoint, status, retcode, reason, bytes,
+        latency(네트워크 왕복 합계), decode(JSON 디코딩), retries, rate_limited_wait, backoff_wait
+        """
+        event.setdefault("timestamp", time.time())
+        self.events.append(event)
+
+    @staticmethod
+    def percentile(values: List[float], percent: float) -> float:
+        """nearest-rank 방식 백분위수"""
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        rank = max(1, math.ceil(percent / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+    def summary(self) -> Dict[str, Any]:
+        """실행 단위 요약 (지연 백분위수, 시간 구성, retcode 분포)"""
+        latencies = [e.get("latency", 0.0) for e in self.events]
+        by_type = Counter(str(e.get("gacha_type", "")) for e in self.events)
+        by_retcode = Counter(str(e.get("retcode")) for e in self.events)
+        return {
+            "requests": len(self.events),
+            "failed": sum(1 for e in self.events if e.get("reason") != "ok"),
+            "retries": sum(e.get("retries", 0) for e in self.events),
+            "bytes": sum(e.get("bytes", 0) for e in self.events),
+            "wall": (max((e["timestamp"] for e in self.events), default=self.started) - self.started),
+            "latency": {
+                "p50": self.percentile(latencies, 50),
+                "p90": self.percentile(latencies, 90),
+                "p99": self.percentile(latencies, 99),
+                "max": max(latencies, default=0.0),
+                "total": sum(latencies),
+            },
+            "time_breakdown": {
+                "network": sum(latencies),
+                "decode": sum(e.get("decode", 0.0) for e in self.events),
+                "rate_limited": sum(e.get("rate_limited_wait", 0.0) for e in self.events),
+                "backoff": sum(e.get("backoff_wait", 0.0) for e in self.events),
+            },
+            "by_gacha_type": dict(by_type),
+            "by_retcode": dict(by_retcode),
+        }
+
+    def format_summary(self) -> str:
+        """로그용 한 줄 요약"""
+        s = self.summary()
+        lat = s["latency"]
+        tb = s["time_breakdown"]
+        return (
+            f"요청 {s['requests']}회 (실패 {s['failed']}, 재시도 {s['retries']}) | {s['bytes']:,} bytes | "
+            f"지연 p50 {lat['p50'] * 1000:.0f}ms p90 {lat['p90'] * 1000:.0f}ms p99 {lat['p99'] * 1000:.0f}ms | "
+            f"네트워크 {tb['network']:.1f}s, 디코딩 {tb['decode']:.2f}s, 속도제한 대기 {tb['rate_limited']:.1f}s, 백오프 {tb['backoff']:.1f}s"
+        )
+
+    def write_json(self, path: str, extra: Optional[Dict[str, Any]] = None) -> None:
+        """요약과 이벤트 전체를 JSON으로 저장"""
+        payload = {"summary": self.summary(), "events": self.events}
+        if extra:
+            payload.update(extra)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
@@ -1,21 +1,27 @@
-import customtkinter as ctk
-from tkinter import messagebox
 import asyncio
-import threading
 import aiohttp
 import json
-import os
-import sys
-import warnings
-import subprocess
-import re
-import winreg
-import tempfile
-import shutil
-from typing import Optional, List, Dict, Any, Tuple
-from urllib.parse import urlparse, parse_qs
-from collections import OrderedDict
+import random
+import math
 import time
+from typing import Optional, List, Dict, Any, Tuple, AsyncIterator
+from urllib.parse import urlparse, parse_qs
+from RateLimiter import RateLimiter
+from ApiCache import ApiCache
+from FetchMetrics import FetchMetrics
+from PageArchive import PageArchive
+from GachaErrors import GachaAPIError, AuthExpiredError, error_from_result
+
+# aiohttp는 brotli 패키지가 있을 때만 br 응답을 풀 수 있으므로 그때만 협상
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = "gzip, deflate, br"
+    except ImportError:
+        ACCEPT_ENCODING = "gzip, deflate"
 
 class GachaAPI:
     """가챠 API 직접 호출 클래스 - 실제 API 구조에 맞게 수정"""
@@ -27,7 +33,89 @@ class GachaAPI:
     # Rust 코드에서 확인된 콜라보 배너 타입들
     COLLABORATION_TYPES = {"21", "22"}  # 실제 콜라보 배너 타입
     
-    def __init__(self, gacha_url: str):
+    # 커넥션 풀 설정 (같은 호스트만 호출하므로 keep-alive로 핸드셰이크 재사용)
+    CONNECTION_LIMIT = 10
+    KEEPALIVE_TIMEOUT = 60
+    DNS_CACHE_TTL = 300
+    
+    # retcode별 재시도 정책: -110(visit too frequently)은 백오프 후 재시도,
+    # -101(인증키 만료)/-111(파라미터 오류)은 즉시 중단
+    RETRYABLE_RETCODES = {-110}
+    FATAL_RETCODES = {-101, -111}
+    MAX_RETRIES = 5
+    BACKOFF_BASE = 1.0
+    BACKOFF_MAX = 30.0
+    
+    # 페이지 크기: 처음엔 큰 값으로 요청해 보고 서버가 실제로 준 개수를 호스트/지역별로 기억
+    DEFAULT_PAGE_SIZE = 20
+    PROBE_PAGE_SIZE = 100
+    PAGE_SIZE_TTL = 7 * 24 * 3600
+    
+    # 콜라보 배너에서 기록이 나온 엔드포인트(또는 "empty")를 기억하는 기간 - 지나면 다시 확인
+    ENDPOINT_CACHE_TTL = 6 * 3600
+    ENDPOINT_EMPTY = "empty"
+    
+    # 링크 검증은 상시 배너 첫 페이지로 하고, 그 응답을 실제 조회 1페이지로 재사용
+    VALIDATION_GACHA_TYPE = "1"
+    
+    # 후보 링크 동시 검증: 죽은 링크를 오래 기다리지 않도록 짧은 타임아웃, 재시도 1회
+    CANDIDATE_TIMEOUT = 5.0
+    CANDIDATE_RETRIES = 1
+    
+    def __init__(self, gacha_url: str, rate_limiter: Optional[RateLimiter] = None, api_cache: Optional[ApiCache] = None,
+                 metrics: Optional[FetchMetrics] = None, archive: Optional[PageArchive] = None,
+                 replay_archive: Optional[PageArchive] = None, replay_uid: Optional[str] = None,
+                 hedge_requests: bool = False, session: Optional[aiohttp.ClientSession] = None):
+        self._set_link(gacha_url)
+        
+        # 고정 sleep 대신 모든 요청이 공유하는 토큰 버킷
+        self.rate_limiter = rate_limiter or RateLimiter()
+        
+        # 조회 한 번(run) 동안 모든 요청이 공유하는 세션
+        # session을 넘기면 그 세션(예: 백그라운드 작업자의 따뜻한 커넥션 풀)을 쓰고 닫지 않음
+        self._session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
+        self.connection_stats = {"requests": 0, "created": 0, "reused": 0, "dns_cache_hits": 0}
+        
+        # 마지막 링크 검증 결과 (_request_page 반환 형식)
+        self.validation_result: Optional[Dict[str, Any]] = None
+        
+        # 후보 링크 동시 검증 결과 {링크: _request_page 반환 형식}
+        self.candidate_results: Dict[str, Dict[str, Any]] = {}
+        
+        # 링크 검증 때 받아 둔 첫 페이지 {(url, gacha_type, lang): 응답}
+        self._prefetched_pages: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        
+        # 요청별 계측 (지연, 바이트, 재시도, 대기 시간)
+        self.metrics = metrics or FetchMetrics()
+        
+        # 원본 페이지 아카이브 (archive: 받은 페이지 저장, replay_archive: 네트워크 대신 아카이브에서 페이지 제공)
+        self.archive = archive
+        self.replay_archive = replay_archive
+        self.replay_uid = replay_uid
+        self._archive_uid = replay_uid or ""
+        
+        # 배너별 마지막 조회 결과 {gacha_type: {"complete", "reason", "retcode", "page", "end_id"}}
+        self.fetch_status: Dict[str, Dict[str, Any]] = {}
+        # 배너별 다음 요청 위치 {"endpoint", "end_id", "page"} (체크포인트용)
+        self.cursors: Dict[str, Dict[str, Any]] = {}
+        
+        # 콜라보 배너 첫 페이지를 두 엔드포인트에 동시에 요청할지 여부
+        self.hedge_requests = hedge_requests
+        self.hedge_stats = {"hedged": 0, "cancelled": 0}
+        
+        # 호스트/지역별로 서버가 허용하는 페이지 크기 (None이면 이번 조회에서 탐색)
+        # 재생 모드에서는 실제 캐시 파일을 건드리지 않음
+        self.api_cache = api_cache or (ApiCache(None) if replay_archive is not None else ApiCache())
+        self._page_size_key = f"page_size|{self.parsed_url.netloc}|{self.base_params.get('region', '')}"
+        self.page_size: Optional[int] = self.api_cache.get(self._page_size_key, ttl=self.PAGE_SIZE_TTL)
+        # 탐색 중 (엔드포인트, 배너)별 직전 페이지 개수 - 다음 페이지가 비어 있지 않으면 그 개수가 서버 상한
+        self._probe_counts: Dict[Tuple[str, str], Tuple[int, str]] = {}
+        # 기본 크기(20)로 조회했을 때와 비교한 요청 수
+        self.page_stats = {"requests": 0, "baseline_requests": 0, "records": 0}
+    
+    def _set_link(self, gacha_url: str) -> None:
+        """링크를 파싱해서 기본 URL/파라미터 설정"""
         self.gacha_url = gacha_url
         self.parsed_url = urlparse(gacha_url)
         self.base_url = f"{self.parsed_url.scheme}://{self.parsed_url.netloc}{self.parsed_url.path}"
@@ -38,6 +126,104 @@ class GachaAPI:
         for key, value in self.params.items():
             self.base_params[key] = value[0] if isinstance(value, list) and len(value) > 0 else value
     
+    def update_link(self, gacha_url: str) -> None:
+        """인증키가 만료됐을 때 새 링크로 교체 - 세션/커넥션 풀, 속도 제한, 계측은 그대로 유지"""
+        self._set_link(gacha_url)
+        self.validation_result = None
+        self._prefetched_pages.clear()
+        self.fetch_status.clear()
+        page_size_key = f"page_size|{self.parsed_url.netloc}|{self.base_params.get('region', '')}"
+        if page_size_key != self._page_size_key:
+            self._page_size_key = page_size_key
+            self.page_size = self.api_cache.get(page_size_key, ttl=self.PAGE_SIZE_TTL)
+    
+    async def __aenter__(self) -> "GachaAPI":
+        await self._get_session()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+    
+    @staticmethod
+    def _create_trace_config() -> aiohttp.TraceConfig:
+        """커넥션 생성/재사용 횟수를 세는 트레이스 설정
+        
+        통계는 요청마다 trace_request_ctx로 넘긴 딕셔너리에 쌓이므로, 세션을 여러 GachaAPI가 공유해도
+        각 인스턴스의 connection_stats에 자기 요청만 집계된다.
+        """
+        trace_config = aiohttp.TraceConfig()
+        
+        def counter(key: str):
+            async def on_event(session, ctx, params):
+                stats = ctx.trace_request_ctx
+                if isinstance(stats, dict):
+                    stats[key] = stats.get(key, 0) + 1
+            return on_event
+        
+        trace_config.on_request_start.append(counter("requests"))
+        trace_config.on_connection_create_end.append(counter("created"))
+        trace_config.on_connection_reuseconn.append(counter("reused"))
+        trace_config.on_dns_cache_hit.append(counter("dns_cache_hits"))
+        return trace_config
+    
+    @classmethod
+    def create_session(cls) -> aiohttp.ClientSession:
+        """keep-alive 커넥션 풀 + DNS 캐시 + 압축 협상이 설정된 세션 생성 (실행 중인 이벤트 루프 안에서 호출)"""
+        connector = aiohttp.TCPConnector(
+            limit=cls.CONNECTION_LIMIT,
+            limit_per_host=cls.CONNECTION_LIMIT,
+            keepalive_timeout=cls.KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=cls.DNS_CACHE_TTL,
+            use_dns_cache=True
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            headers={"Accept-Encoding": ACCEPT_ENCODING},
+            trace_configs=[cls._create_trace_config()]
+        )
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """공유 세션 반환 (없거나 닫혔으면 새로 생성)"""
+        if self._session is None or self._session.closed:
+            self._session = self.create_session()
+            self._owns_session = True
+        return self._session
+    
+    async def close(self) -> None:
+        """공유 세션 종료 (아카이브 파일도 함께 닫음) - 밖에서 받은 세션은 닫지 않음"""
+        if self._owns_session and self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        if self.archive is not None:
+            self.archive.close()
+    
+    def get_connection_summary(self) -> str:
+        """커넥션 재사용 통계 문자열"""
+        stats = self.connection_stats
+        return (
+            f"요청 {stats['requests']}회 | 새 연결 {stats['created']}회 | "
+            f"재사용 {stats['reused']}회 | DNS 캐시 적중 {stats['dns_cache_hits']}회"
+        )
+    
+    def get_page_size_summary(self) -> str:
+        """페이지 크기 탐색으로 절약한 요청 수 문자열"""
+        stats = self.page_stats
+        saved = stats["baseline_requests"] - stats["requests"]
+        return (
+            f"페이지 크기 {self.page_size or self.DEFAULT_PAGE_SIZE} | 기록 {stats['records']}개 | "
+            f"요청 {stats['requests']}회 (기본 크기 대비 {saved}회 절약)"
+        ) + (f" | 동시 요청 {self.hedge_stats['hedged']}회 (취소 {self.hedge_stats['cancelled']}회)" if self.hedge_stats["hedged"] else "")
+    
+    def determined_retcode(self, result: Optional[Dict[str, Any]]) -> Optional[int]:
+        """요청 결과에서 링크 상태를 확정할 수 있는 retcode만 반환 (-110/네트워크 오류처럼 일시적인 실패는 None)"""
+        if not result:
+            return None
+        if result["ok"]:
+            return 0
+        if result["retcode"] in self.FATAL_RETCODES:
+            return result["retcode"]
+        return None
+    
     def _build_url_for_gacha_type(self, gacha_type: str) -> str:
         """가챠 타입에 따라 URL 엔드포인트 결정 - 콜라보 배너는 특별 엔드포인트 사용 가능"""
         # 콜라보 배너는 특별한 엔드포인트를 사용할 수 있음
@@ -48,112 +234,510 @@ class GachaAPI:
             # 일반 배너는 기본 엔드포인트 사용
             return self.base_url.replace(self.END_COLLABORATION, self.END_DEFAULT)
     
-    async def fetch_gacha_records(self, gacha_type: str, lang: str = "ko") -> List[Dict[str, Any]]:
-        """특정 배너의 가챠 기록을 모두 가져오기 - 콜라보 배너 지원"""
-        all_records = []
-        page = 1
-        end_id = "0"
+    @staticmethod
+    def record_id_value(record_id: Any) -> int:
+        """가챠 기록 id(숫자 문자열)를 비교 가능한 정수로 변환"""
+        try:
+            return int(record_id)
+        except (TypeError, ValueError):
+            return 0
+    
+    @classmethod
+    def _split_known_records(cls, records: List[Dict[str, Any]], high_water: Optional[Dict[str, str]]) -> Tuple[List[Dict[str, Any]], bool]:
+        """페이지에서 이미 저장된 기록(high-water mark 이하)을 잘라내고, 기존 데이터에 닿았는지 여부를 함께 반환"""
+        if not high_water:
+            return records, False
+        
+        new_records = []
+        reached_known = False
+        for record in records:
+            mark = high_water.get(str(record.get("uid", "")))
+            if mark and cls.record_id_value(record.get("id")) <= cls.record_id_value(mark):
+                # 최신순으로 내려오므로 이후 기록은 모두 이미 저장된 것
+                reached_known = True
+                break
+            new_records.append(record)
+        return new_records, reached_known
+    
+    def _backoff_delay(self, attempt: int) -> float:
+        """지수 백오프 + 지터 (equal jitter: 최소 대기의 절반은 보장)"""
+        cap = min(self.BACKOFF_MAX, self.BACKOFF_BASE * (2 ** attempt))
+        return cap / 2 + random.uniform(0, cap / 2)
+    
+    async def _request_page(self, url: str, params: Dict[str, str], timeout: float = 30,
+                            max_retries: Optional[int] = None) -> Dict[str, Any]:
+        """페이지 하나 요청 - retcode 종류에 따라 재시도하거나 즉시 중단
+        
+        반환: {"ok": bool, "data": 응답 JSON 또는 None, "retcode": int 또는 None, "reason": str}
+        요청마다 self.metrics에 이벤트(지연, 바이트, 재시도, 대기 시간 등)를 하나 기록한다.
+        """
+        if self.replay_archive is not None:
+            return self._replay_page(url, params)
+        
+        session = await self._get_session()
+        last_reason = "unknown"
+        last_retcode = None
+        trace = {
+            "gacha_type": params.get("gacha_type"),
+            "page": params.get("page"),
+            "size": params.get("size"),
+            "endpoint": url.split('/')[-1],
+            "status": None,
+            "bytes": 0,
+            "latency": 0.0,
+            "decode": 0.0,
+            "retries": 0,
+            "rate_limited_wait": 0.0,
+            "backoff_wait": 0.0,
+        }
+        
+        def finish(result: Dict[str, Any]) -> Dict[str, Any]:
+            self.metrics.record(retcode=result["retcode"], reason=result["reason"], **trace)
+            return result
+        
+        max_retries = self.MAX_RETRIES if max_retries is None else max_retries
+        for attempt in range(max_retries + 1):
+            if attempt > 0:
+                delay = self._backoff_delay(attempt - 1)
+                print(f"🔁 재시도 {attempt}/{max_retries} - {delay:.1f}초 대기 ({last_reason})")
+                await asyncio.sleep(delay)
+                trace["retries"] = attempt
+                trace["backoff_wait"] += delay
+            
+            try:
+                trace["rate_limited_wait"] += await self.rate_limiter.acquire()
+                request_started = time.perf_counter()
+                try:
+                    async with session.get(url, params=params, timeout=timeout, trace_request_ctx=self.connection_stats) as response:
+                        trace["status"] = response.status
+                        body = await response.read()
+                        trace["bytes"] += len(body)
+                finally:
+                    trace["latency"] += time.perf_counter() - request_started
+                
+                if response.status == 429 or response.status >= 500:
+                    last_reason = f"http_{response.status}"
+                    print(f"HTTP 오류: {response.status}")
+                    continue
+                if response.status != 200:
+                    print(f"HTTP 오류: {response.status}")
+                    return finish({"ok": False, "data": None, "retcode": None, "reason": f"http_{response.status}"})
+                
+                decode_started = time.perf_counter()
+                try:
+                    data = json.loads(body)
+                finally:
+                    trace["decode"] += time.perf_counter() - decode_started
+            except asyncio.TimeoutError:
+                last_reason = "timeout"
+                print(f"타임아웃 발생 - page={params.get('page')}")
+                continue
+            except aiohttp.ClientError as e:
+                last_reason = "transport"
+                print(f"요청 오류 - page={params.get('page')}: {e}")
+                continue
+            except ValueError as e:
+                last_reason = "invalid_json"
+                print(f"응답 해석 실패 - page={params.get('page')}: {e}")
+                continue
+            
+            retcode = data.get("retcode") if isinstance(data, dict) else None
+            if retcode == 0:
+                self._archive_page(url, params, data)
+                return finish({"ok": True, "data": data, "retcode": 0, "reason": "ok"})
+            
+            message = data.get("message", "Unknown error") if isinstance(data, dict) else "invalid response"
+            print(f"API 오류: retcode={retcode}, message={message}")
+            last_retcode = retcode
+            if retcode in self.RETRYABLE_RETCODES:
+                last_reason = f"retcode_{retcode}"
+                continue
+            # -101(인증키 만료), -111(파라미터 오류) 등은 재시도해도 소용없으므로 즉시 중단
+            if retcode in self.FATAL_RETCODES:
+                print(f"⛔ 재시도 불가 오류 - 즉시 중단 (retcode={retcode})")
+            return finish({"ok": False, "data": data, "retcode": retcode, "reason": f"retcode_{retcode}"})
+        
+        print(f"❌ 재시도 한도 초과 ({last_reason})")
+        return finish({"ok": False, "data": None, "retcode": last_retcode, "reason": last_reason})
+    
+    def _archive_page(self, url: str, params: Dict[str, str], data: Dict[str, Any]) -> None:
+        """성공한 원본 페이지를 (uid, gacha_type, end_id) 키로 아카이브에 추가"""
+        if self.archive is None:
+            return
+        records = (data.get("data") or {}).get("list") or []
+        if records:
+            self._archive_uid = str(records[0].get("uid", "")) or self._archive_uid
+        try:
+            self.archive.append(
+                self._archive_uid, params.get("gacha_type", ""), url.split('/')[-1], params.get("end_id", "0"), data,
+                lang=params.get("lang", ""), size=params.get("size", "")
+            )
+        except Exception as e:
+            print(f"아카이브 저장 실패: {e}")
+    
+    def _replay_page(self, url: str, params: Dict[str, str]) -> Dict[str, Any]:
+        """아카이브에서 페이지 제공 - 아카이브된 기록 중 end_id보다 오래된 기록을 size개 (없으면 빈 페이지 = 기록 끝)"""
+        if not self._archive_uid:
+            uids = self.replay_archive.uids()
+            self._archive_uid = uids[0] if len(uids) == 1 else ""
+            if len(uids) > 1:
+                print(f"⚠️ 아카이브에 여러 uid가 있습니다 - replay_uid를 지정하세요: {uids}")
+        
+        endpoint = url.split('/')[-1]
+        size = int(params.get("size") or self.DEFAULT_PAGE_SIZE)
+        data = self.replay_archive.replay_page(self._archive_uid, params.get("gacha_type", ""), endpoint, params.get("end_id", "0"), size)
+        self.metrics.record(
+            gacha_type=params.get("gacha_type"), page=params.get("page"), size=params.get("size"), endpoint=endpoint,
+            status=None, retcode=0, reason="ok", bytes=0, latency=0.0, decode=0.0, retries=0,
+            rate_limited_wait=0.0, backoff_wait=0.0, replayed=True
+        )
+        return {"ok": True, "data": data, "retcode": 0, "reason": "ok"}
+    
+    def _endpoint_cache_key(self, gacha_type: str) -> str:
+        return f"endpoint|{self.parsed_url.netloc}|{gacha_type}"
+    
+    def _apply_endpoint_cache(self, gacha_type: str, urls_to_try: List[str]) -> List[str]:
+        """디스크에 기억된 결과로 시도할 엔드포인트 목록 줄이기"""
+        if len(urls_to_try) < 2:
+            return urls_to_try
+        
+        cached = self.api_cache.get(self._endpoint_cache_key(gacha_type), ttl=self.ENDPOINT_CACHE_TTL)
+        if not cached:
+            return urls_to_try
+        if cached == self.ENDPOINT_EMPTY:
+            # 두 엔드포인트 모두 비어 있었음 - 새 기록이 생겼는지는 우선 엔드포인트 한 곳만 확인
+            print(f"💾 배너 {gacha_type}: 최근 기록 없음으로 확인됨 - {urls_to_try[0].split('/')[-1]}만 확인")
+            return urls_to_try[:1]
+        
+        matched = [url for url in urls_to_try if url.split('/')[-1] == cached]
+        if matched:
+            print(f"💾 배너 {gacha_type}: 기억된 엔드포인트 {cached} 사용")
+            return matched
+        return urls_to_try
+    
+    def _remember_endpoint(self, gacha_type: str, endpoint: str) -> None:
+        """배너별로 기록이 나온 엔드포인트(또는 empty)를 디스크에 기억"""
+        key = self._endpoint_cache_key(gacha_type)
+        if self.api_cache.get(key, ttl=self.ENDPOINT_CACHE_TTL) != endpoint:
+            self.api_cache.set(key, endpoint)
+    
+    def _is_size_rejected(self, result: Dict[str, Any]) -> bool:
+        """탐색 요청 실패가 큰 size 거부일 수 있는지 (-101 만료, 속도 제한, 네트워크 오류는 제외)"""
+        retcode, reason = result["retcode"], result["reason"]
+        if retcode in self.RETRYABLE_RETCODES or retcode == AuthExpiredError.RETCODE:
+            return False
+        if retcode is not None:
+            return True
+        return reason.startswith("http_4") and reason != "http_429"
+    
+    def _set_page_size(self, page_size: int) -> None:
+        self.page_size = page_size
+        self._probe_counts.clear()
+        self.api_cache.set(self._page_size_key, page_size)
+        print(f"📏 페이지 크기 탐색 완료: {page_size} ({self.parsed_url.netloc})")
+    
+    async def _request_records_page(self, url: str, params: Dict[str, str], timeout: float = 30) -> Dict[str, Any]:
+        """기록 페이지 요청 - 페이지 크기를 아직 모르면 이 요청으로 탐색하고 결과를 캐시"""
+        probing = self.page_size is None
+        params["size"] = str(self.page_size or self.PROBE_PAGE_SIZE)
+        result = await self._request_page(url, params, timeout=timeout)
+        
+        if probing and not result["ok"] and self._is_size_rejected(result):
+            # 큰 size를 거부하는 서버 - 기본 크기로 같은 페이지 재요청
+            print(f"📏 페이지 크기 {params['size']} 거부됨 - {self.DEFAULT_PAGE_SIZE}로 재시도")
+            params["size"] = str(self.DEFAULT_PAGE_SIZE)
+            result = await self._request_page(url, params, timeout=timeout)
+            if result["ok"]:
+                self._set_page_size(self.DEFAULT_PAGE_SIZE)
+        
+        if not result["ok"]:
+            return result
+        
+        records = (result["data"].get("data") or {}).get("list", [])
+        count = len(records)
+        if probing and self.page_size is None:
+            probe_key = (url.split('/')[-1], params.get("gacha_type", ""))
+            previous_count, previous_last_id = self._probe_counts.get(probe_key, (0, None))
+            if count >= self.PROBE_PAGE_SIZE:
+                self._set_page_size(self.PROBE_PAGE_SIZE)
+            elif count and previous_count and params.get("end_id") == previous_last_id:
+                # 직전 페이지 바로 뒤에 기록이 더 있음 = 직전 페이지는 서버가 자른 꽉 찬 페이지
+                self._set_page_size(previous_count)
+            elif count:
+                # 적게 온 것만으로는 기록 자체가 적은 배너인지 서버 상한인지 알 수 없으므로 판단 보류
+                self._probe_counts[probe_key] = (count, str(records[-1].get("id")))
+        
+        self.page_stats["requests"] += 1
+        self.page_stats["records"] += count
+        self.page_stats["baseline_requests"] += max(1, math.ceil(count / self.DEFAULT_PAGE_SIZE))
+        return result
+    
+    async def _hedge_first_page(self, gacha_type: str, lang: str, urls_to_try: List[str]) -> List[str]:
+        """두 엔드포인트에 첫 페이지를 동시에 요청하고 기록이 먼저 온 쪽을 앞으로 정렬
+        
+        각 요청은 공유 속도 제한 토큰을 따로 받으며, 이긴 쪽이 정해지면 나머지 요청은 취소한다.
+        받은 응답은 self._prefetched_pages에 넣어 두므로 이후 페이지네이션에서 다시 요청하지 않는다.
+        """
+        def first_page_params() -> Dict[str, str]:
+            params = self.base_params.copy()
+            params.update({"gacha_type": gacha_type, "page": "1", "end_id": "0", "lang": lang})
+            return params
+        
+        tasks = {asyncio.ensure_future(self._request_records_page(url, first_page_params())): url for url in urls_to_try}
+        self.hedge_stats["hedged"] += 1
+        winner = None
+        pending = set(tasks)
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    url = tasks[task]
+                    result = task.result()
+                    self._prefetched_pages[(url, gacha_type, lang)] = result
+                    if winner is None and result["ok"] and (result["data"].get("data") or {}).get("list"):
+                        winner = url
+        finally:
+            for task in pending:
+                task.cancel()
+                self.hedge_stats["cancelled"] += 1
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        
+        if winner is None:
+            return urls_to_try
+        print(f"⚡ 배너 {gacha_type}: 동시 요청 중 {winner.split('/')[-1]}에서 먼저 기록 수신")
+        return [winner] + [url for url in urls_to_try if url != winner]
+    
+    async def iter_pages(self, gacha_type: str, lang: str = "ko", high_water: Optional[Dict[str, str]] = None,
+                         resume: Optional[Dict[str, Any]] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """특정 배너의 가챠 기록을 페이지 단위로 스트리밍 - 콜라보 배너 지원
+        
+        async for page in api.iter_pages("11"): ... 형태로 사용하며, 페이지를 받는 즉시 새 기록 목록을 yield한다.
+        high_water: {uid: 이미 저장된 가장 최신 기록 id}. 주어지면 저장된 기록에 닿는 페이지에서 조회를 멈춘다.
+        resume: 체크포인트 커서 {"endpoint", "end_id", "page"}. 주어지면 그 엔드포인트의 그 위치부터 이어서 조회한다.
+        페이지를 yield하기 직전에 다음 요청 위치가 self.cursors[gacha_type]에 기록된다.
+        완료 여부는 순회가 끝난 뒤 self.fetch_status[gacha_type]에 기록된다 (complete=False면 중간에 끊긴 것).
+        끝까지 받지 못하면 fetch_status를 남긴 뒤 GachaAPIError 하위 예외를 발생시킨다.
+        AuthExpiredError는 다른 엔드포인트를 시도하지 않고 바로 발생한다.
+        """
+        status = {"complete": False, "reason": "not_started", "retcode": None, "page": 1, "end_id": "0"}
+        error: Optional[GachaAPIError] = None
         
         # 가챠 타입에 맞는 URL 선택
         request_url = self._build_url_for_gacha_type(gacha_type)
         
-        async with aiohttp.ClientSession() as session:
-            # 콜라보 배너의 경우 두 가지 엔드포인트 모두 시도
-            urls_to_try = [request_url]
-            if gacha_type in self.COLLABORATION_TYPES:
-                # 기본 엔드포인트도 추가로 시도
-                fallback_url = self.base_url.replace(self.END_COLLABORATION, self.END_DEFAULT)
-                if fallback_url != request_url:
-                    urls_to_try.append(fallback_url)
+        # 콜라보 배너의 경우 두 가지 엔드포인트 모두 시도
+        urls_to_try = [request_url]
+        if gacha_type in self.COLLABORATION_TYPES:
+            # 기본 엔드포인트도 추가로 시도
+            fallback_url = self.base_url.replace(self.END_COLLABORATION, self.END_DEFAULT)
+            if fallback_url != request_url:
+                urls_to_try.append(fallback_url)
+        if resume:
+            # 체크포인트를 만든 엔드포인트에서만 이어서 조회 (커서는 엔드포인트마다 다름)
+            urls_to_try = [url for url in urls_to_try if url.split('/')[-1] == resume.get("endpoint")] or urls_to_try[:1]
+        else:
+            urls_to_try = self._apply_endpoint_cache(gacha_type, urls_to_try)
+            if self.hedge_requests and len(urls_to_try) > 1:
+                urls_to_try = await self._hedge_first_page(gacha_type, lang, urls_to_try)
+        working_endpoint = None
+        # 오류로 끝난 엔드포인트의 상태/예외 - 다른 엔드포인트가 비어 있어도 "기록 없음"으로 판단하지 않도록 남겨 둠
+        failed: Optional[Tuple[Dict[str, Any], GachaAPIError]] = None
+        
+        for url_to_try in urls_to_try:
+            page = int(resume.get("page") or 1) if resume else 1
+            end_id = str(resume.get("end_id") or "0") if resume else "0"
+            total = 0
+            reached_known = False
+            error = None
+            
+            print(f"🔗 URL 시도: {url_to_try.split('/')[-1]} (gacha_type={gacha_type})")
             
-            for url_to_try in urls_to_try:
-                page = 1
-                end_id = "0"
-                all_records = []
+            while True:
+                params = self.base_params.copy()
+                params.update({
+                    "gacha_type": gacha_type,
+                    "page": str(page),
+                    "end_id": end_id,
+                    "lang": lang
+                })
                 
-                print(f"🔗 URL 시도: {url_to_try.split('/')[-1]} (gacha_type={gacha_type})")
+                prefetched = self._prefetched_pages.pop((url_to_try, gacha_type, lang), None) if end_id == "0" else None
+                if prefetched is not None:
+                    # 링크 검증 때 받은 첫 페이지 재사용 (요청 1회 절약)
+                    result = prefetched
+                else:
+                    # 실패 시 같은 end_id로 재시도하므로 커서가 유지됨
+                    result = await self._request_records_page(url_to_try, params)
+                if not result["ok"]:
+                    status = {"complete": False, "reason": result["reason"], "retcode": result["retcode"], "page": page, "end_id": end_id}
+                    print(f"⚠️ 배너 {gacha_type} 조회 중단 - 페이지 {page} (end_id={end_id}, {result['reason']})")
+                    error = error_from_result(result, gacha_type, page)
+                    break
+                
+                records = (result["data"].get("data") or {}).get("list", [])
+                if not records:
+                    print(f"더 이상 데이터 없음 - 총 {total}개 기록")
+                    status = {"complete": True, "reason": "end", "retcode": 0, "page": page, "end_id": end_id}
+                    break
                 
-                while True:
-                    params = self.base_params.copy()
-                    params.update({
-                        "gacha_type": gacha_type,
-                        "page": str(page),
-                        "size": "20",
-                        "end_id": end_id,
-                        "lang": lang
-                    })
-                    
-                    try:
-                        async with session.get(url_to_try, params=params, timeout=30) as response:
-                            if response.status != 200:
-                                print(f"HTTP 오류: {response.status}")
-                                break
-                                
-                            data = await response.json()
-                            
-                            if data.get("retcode") != 0:
-                                print(f"API 오류: retcode={data.get('retcode')}, message={data.get('message', 'Unknown error')}")
-                                break
-                        
-                            records = data.get("data", {}).get("list", [])
-                            if not records:
-                                print(f"더 이상 데이터 없음 - 총 {len(all_records)}개 기록")
-                                break
-                        
-                            all_records.extend(records)
-                        
-                            # 다음 페이지 준비
-                            end_id = records[-1].get("id", "0")
-                            page += 1
-                        
-                            print(f"배너 {gacha_type} - 페이지 {page-1}: {len(records)}개 기록 (누적: {len(all_records)}개)")
-                        
-                            # API 호출 간격 (과부하 방지)
-                            await asyncio.sleep(0.5)
-                        
-                    except asyncio.TimeoutError:
-                        print(f"타임아웃 발생 - 페이지 {page}")
-                        break
-                    except Exception as e:
-                        print(f"요청 오류 - 페이지 {page}: {e}")
-                        break
+                new_records, reached_known = self._split_known_records(records, high_water)
+                total += len(new_records)
                 
-                # 데이터를 성공적으로 가져왔으면 중단
-                if all_records:
-                    print(f"✅ {url_to_try.split('/')[-1]}에서 성공: {len(all_records)}개 기록")
+                # 다음 페이지 준비
+                end_id = records[-1].get("id", "0")
+                page += 1
+                
+                print(f"배너 {gacha_type} - 페이지 {page-1}: {len(new_records)}개 기록 (누적: {total}개)")
+                
+                if new_records:
+                    self.cursors[gacha_type] = {"endpoint": url_to_try.split('/')[-1], "end_id": end_id, "page": page}
+                    yield new_records
+                
+                if reached_known:
+                    print(f"⏹️ 저장된 기록에 도달 - 배너 {gacha_type} 조회 종료")
+                    status = {"complete": True, "reason": "reached_known", "retcode": 0, "page": page, "end_id": end_id}
                     break
-                else:
-                    print(f"❌ {url_to_try.split('/')[-1]}에서 실패")
+            
+            if isinstance(error, AuthExpiredError):
+                # 만료된 인증키로는 다른 엔드포인트도 실패하므로 바로 중단
+                break
+            if error is not None and failed is None:
+                failed = (status, error)
+            if resume and status["complete"]:
+                # 체크포인트에서 이어 받은 엔드포인트 - 남은 페이지가 비어 있어도 이 엔드포인트에 기록이 있음
+                working_endpoint = url_to_try.split('/')[-1]
+                break
+            # 데이터를 성공적으로 가져왔거나 이 엔드포인트에 기존 기록이 있으면 중단
+            if reached_known and not total:
+                print(f"✅ {url_to_try.split('/')[-1]}: 신규 기록 없음")
+                working_endpoint = url_to_try.split('/')[-1]
+                break
+            if total:
+                print(f"✅ {url_to_try.split('/')[-1]}에서 성공: {total}개 기록")
+                working_endpoint = url_to_try.split('/')[-1]
+                break
+            else:
+                print(f"❌ {url_to_try.split('/')[-1]}에서 실패")
+        
+        if gacha_type in self.COLLABORATION_TYPES:
+            if working_endpoint:
+                self._remember_endpoint(gacha_type, working_endpoint)
+            elif status["complete"] and failed is None:
+                # 시도한 엔드포인트가 모두 오류 없이 끝까지 비어 있었던 경우만 "empty"로 기억 (오류는 기억하지 않음)
+                self._remember_endpoint(gacha_type, self.ENDPOINT_EMPTY)
+        if working_endpoint is None and failed is not None:
+            # 한 엔드포인트라도 오류로 끊겼으면 다른 엔드포인트가 비어 있어도 완료로 보지 않음
+            status, error = failed
         
+        # 동시 요청에서 쓰이지 않은 응답이 다음 조회에 섞이지 않도록 정리
+        for url in urls_to_try:
+            self._prefetched_pages.pop((url, gacha_type, lang), None)
+        
+        self.fetch_status[gacha_type] = status
+        if error is not None and not status["complete"]:
+            raise error
+    
+    async def has_records(self, gacha_type: str, lang: str = "ko") -> bool:
+        """첫 페이지 1건만 요청해서 이 배너/언어 조합에 기록이 있는지 확인 (전체 페이지네이션 없이)"""
+        urls_to_try = [self._build_url_for_gacha_type(gacha_type)]
+        if gacha_type in self.COLLABORATION_TYPES:
+            fallback_url = self.base_url.replace(self.END_COLLABORATION, self.END_DEFAULT)
+            if fallback_url not in urls_to_try:
+                urls_to_try.append(fallback_url)
+        
+        for url in self._apply_endpoint_cache(gacha_type, urls_to_try):
+            params = self.base_params.copy()
+            params.update({"gacha_type": gacha_type, "page": "1", "size": "1", "end_id": "0", "lang": lang})
+            result = await self._request_page(url, params)
+            if result["ok"] and (result["data"].get("data") or {}).get("list"):
+                return True
+            if result["retcode"] == AuthExpiredError.RETCODE:
+                raise error_from_result(result, gacha_type, 1)
+        return False
+    
+    async def fetch_gacha_records(self, gacha_type: str, lang: str = "ko", high_water: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        """특정 배너의 가챠 기록을 모두 가져오기 (iter_pages를 끝까지 모은 결과, 실패 시 GachaAPIError 발생)"""
+        all_records = []
+        async for page in self.iter_pages(gacha_type, lang, high_water=high_water):
+            all_records.extend(page)
         return all_records
     
-    async def validate_link(self) -> bool:
-        """가챠 링크 유효성 검증 - 더 관대한 검증"""
+    async def validate_link(self, lang: str = "ko") -> bool:
+        """가챠 링크 유효성 검증 - 상시 배너 첫 페이지를 실제 조회와 같은 조건으로 요청
+        
+        응답은 버리지 않고 보관했다가 iter_pages("1", lang)의 1페이지로 그대로 재사용한다.
+        """
         try:
-            async with aiohttp.ClientSession() as session:
-                # 일반 배너로 테스트 - 기존 URL 파라미터 그대로 사용
-                params = self.base_params.copy()
-                params.update({
-                    "gacha_type": "1",
-                    "page": "1",
-                    "size": "5",
-                    "end_id": "0"
-                    # lang 파라미터는 기존 것 유지
-                })
+            gacha_type = self.VALIDATION_GACHA_TYPE
+            url = self._build_url_for_gacha_type(gacha_type)
+            params = self.base_params.copy()
+            params.update({
+                "gacha_type": gacha_type,
+                "page": "1",
+                "end_id": "0",
+                "lang": lang
+            })
+            
+            # -110은 백오프 후 재시도, 페이지 크기 탐색도 이 요청으로 함께 진행
+            result = await self._request_records_page(url, params, timeout=15)
+            print(f"API 응답: retcode={result['retcode']}, reason={result['reason']}")
+            
+            # retcode가 0이면 성공, -101은 인증키 만료, -111은 파라미터 오류
+            self.validation_result = result
+            if result["ok"]:
+                self._prefetched_pages[(url, gacha_type, lang)] = result
+            return result["ok"]
                 
-                # 기본 URL 사용 (엔드포인트 변경 없이)
-                async with session.get(self.base_url, params=params, timeout=15) as response:
-                    print(f"검증 응답 상태: {response.status}")
-                    
-                    if response.status != 200:
-                        return False
-                    
-                    data = await response.json()
-                    print(f"API 응답: retcode={data.get('retcode')}, message={data.get('message', 'N/A')}")
-                    
-                    # retcode가 0이면 성공, -101은 인증키 만료, -111은 파라미터 오류
-                    return data.get("retcode") == 0
-                    
         except Exception as e:
             print(f"링크 검증 실패: {e}")
-            return False
\ No newline at end of file
+            return False
+    
+    async def select_live_link(self, candidates: List[str], lang: str = "ko",
+                               timeout: Optional[float] = None) -> Optional[str]:
+        """후보 링크들을 동시에 검증하고 retcode 0을 가장 먼저 돌려준 링크로 교체
+        
+        각 후보는 validate_link와 같은 상시 배너 첫 페이지 요청으로 확인하며(짧은 타임아웃),
+        이긴 링크의 응답은 검증 결과와 첫 페이지로 보관해 재사용한다. 나머지 요청은 취소된다.
+        후보별 결과는 self.candidate_results({링크: 결과})에 남는다. 살아 있는 링크가 없으면 None.
+        """
+        timeout = timeout or self.CANDIDATE_TIMEOUT
+        self.candidate_results = {}
+        
+        async def check(link: str) -> Tuple[str, Dict[str, Any]]:
+            parsed = urlparse(link)
+            url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}".replace(self.END_COLLABORATION, self.END_DEFAULT)
+            params = {key: value[0] for key, value in parse_qs(parsed.query).items() if value}
+            params.update({
+                "gacha_type": self.VALIDATION_GACHA_TYPE,
+                "page": "1",
+                "end_id": "0",
+                "lang": lang,
+                "size": str(self.page_size or self.DEFAULT_PAGE_SIZE),
+            })
+            return link, await self._request_page(url, params, timeout=timeout, max_retries=self.CANDIDATE_RETRIES)
+        
+        tasks = [asyncio.ensure_future(check(link)) for link in candidates]
+        winner = None
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                link, result = await next_done
+                self.candidate_results[link] = result
+                if result["ok"]:
+                    winner = (link, result)
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        
+        print(f"🔎 후보 링크 {len(candidates)}개 동시 검증: {'성공' if winner else '모두 실패'} ({len(self.candidate_results)}개 응답)")
+        if winner is None:
+            return None
+        
+        link, result = winner
+        if link != self.gacha_url:
+            self.update_link(link)
+        self.validation_result = result
+        self._prefetched_pages[(self._build_url_for_gacha_type(self.VALIDATION_GACHA_TYPE), self.VALIDATION_GACHA_TYPE, lang)] = result
+        return link
@@ -0,0 +1,188 @@
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Optional, List, Dict, Any
+
+from aiohttp import web
+
+
+class GachaAPIEmulator:
+    """getGachaLog/getLdGachaLog를 흉내 내는 로컬 aiohttp 서버 - 오프라인 테스트/부하 벤치마크용
+
+    - end_id 커서: end_id보다 작은 id의 기록을 최신순으로 size개 반환 (end_id=0이면 처음부터)
+    - latency: 응답마다 지연(초) + 무작위 지터
+    - rate_limit_rps: 초당 허용 요청 수를 넘으면 -110 (visit too frequently)
+    - rate_limited_prob: 무작위로 -110을 섞는 확률
+    - auth_expire_after: 요청 N회 이후부터 -101 (authkey timeout)
+    - max_page_size: 서버가 허용하는 최대 size (초과 요청은 잘라서 응답)
+    """
+
+    API_PATH = "/common/gacha_record/api"
+    END_DEFAULT = "getGachaLog"
+    END_COLLABORATION = "getLdGachaLog"
+    COLLABORATION_TYPES = {"21", "22"}
+    AUTHKEY = "EMULATOR-AUTHKEY"
+
+    def __init__(
+        self,
+        pulls: Optional[Dict[str, int]] = None,
+        uid: str = "800000001",
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        rate_limit_rps: Optional[float] = None,
+        rate_limited_prob: float = 0.0,
+        auth_expire_after: Optional[int] = None,
+        max_page_size: int = 20,
+        seed: int = 0,
+    ):
+        # 배너별 기록 수 (기본: 한정 캐릭터/광추/상시에 기록, 콜라보/초보자는 비어 있음)
+        self.pulls = pulls if pulls is not None else {"11": 900, "12": 400, "21": 0, "22": 0, "1": 220, "2": 50}
+        self.uid = uid
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.rate_limit_rps = rate_limit_rps
+        self.rate_limited_prob = rate_limited_prob
+        self.auth_expire_after = auth_expire_after
+        self.max_page_size = max_page_size
+        self._random = random.Random(seed)
+
+        self.histories = {gacha_type: self._generate_history(gacha_type, count) for gacha_type, count in self.pulls.items()}
+        self.stats = {"requests": 0, "rate_limited": 0, "auth_expired": 0, "records_served": 0}
+        self._request_times: List[float] = []
+
+        self._runner: Optional[web.AppRunner] = None
+        self.port: Optional[int] = None
+
+    def _generate_history(self, gacha_type: str, count: int, first_index: int = 0) -> List[Dict[str, Any]]:
+        """최신순으로 정렬된 가상 기록 생성 (id는 시간순으로 증가하는 19자리 숫자 문자열)"""
+        records = []
+        start = datetime(2024, 1, 1)
+        base_id = 1700000000000000000 + int(gacha_type) * 10_000_000
+        for i in range(first_index, first_index + count):
+            roll = self._random.random()
+            rank = "5" if roll < 0.016 else "4" if roll < 0.146 else "3"
+            records.append({
+                "uid": self.uid,
+                "gacha_id": "2001",
+                "gacha_type": gacha_type,
+                "item_id": str(1000 + self._random.randint(1, 300)) if rank != "3" else str(20000 + self._random.randint(0, 20)),
+                "count": "1",
+                "time": (start + timedelta(minutes=i * 3)).strftime("%Y-%m-%d %H:%M:%S"),
+                "name": f"Item-{i}",
+                "lang": "ko-kr",
+                "item_type": "Light Cone" if rank == "3" else "Character",
+                "rank_type": rank,
+                "id": str(base_id + i),
+            })
+        records.reverse()
+        return records
+
+    def add_pulls(self, gacha_type: str, count: int) -> None:
+        """새 뽑기 기록 추가 (기존 기록보다 최신) - 증분 조회 테스트용"""
+        history = self.histories.setdefault(gacha_type, [])
+        self.histories[gacha_type] = self._generate_history(gacha_type, count, len(history)) + history
+        self.pulls[gacha_type] = len(self.histories[gacha_type])
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}{self.API_PATH}"
+
+    @property
+    def gacha_url(self) -> str:
+        """실제 게임이 남기는 링크와 같은 형태의 가챠 URL"""
+        return (
+            f"{self.base_url}/{self.END_DEFAULT}?authkey_ver=1&sign_type=2&auth_appid=webview_gacha"
+            f"&authkey={self.AUTHKEY}&lang=ko&game_biz=hkrpg_global&region=prod_official_asia"
+        )
+
+    def _is_rate_limited(self) -> bool:
+        """초당 요청 수 제한 초과 또는 무작위 -110 주입 여부"""
+        now = time.monotonic()
+        if self.rate_limit_rps:
+            self._request_times = [t for t in self._request_times if now - t < 1.0]
+            self._request_times.append(now)
+            if len(self._request_times) > self.rate_limit_rps:
+                return True
+        return self._random.random() < self.rate_limited_prob
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.stats["requests"] += 1
+        endpoint = request.path.rsplit("/", 1)[-1]
+        query = request.query
+
+        delay = self.latency + self._random.uniform(0, self.latency_jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if query.get("authkey") != self.AUTHKEY or (
+            self.auth_expire_after is not None and self.stats["requests"] > self.auth_expire_after
+        ):
+            self.stats["auth_expired"] += 1
+            return web.json_response({"retcode": -101, "message": "authkey timeout", "data": None})
+
+        if self._is_rate_limited():
+            self.stats["rate_limited"] += 1
+            return web.json_response({"retcode": -110, "message": "visit too frequently", "data": None})
+
+        gacha_type = query.get("gacha_type", "")
+        try:
+            size = max(1, min(int(query.get("size", "20")), self.max_page_size))
+            end_id = int(query.get("end_id", "0"))
+        except ValueError:
+            return web.json_response({"retcode": -111, "message": "params error", "data": None})
+
+        # 콜라보 배너는 getLdGachaLog에서만, 나머지는 getGachaLog에서만 기록이 나옴
+        serves_type = (gacha_type in self.COLLABORATION_TYPES) == (endpoint == self.END_COLLABORATION)
+        history = self.histories.get(gacha_type, []) if serves_type else []
+        if end_id:
+            history = [record for record in history if int(record["id"]) < end_id]
+        page = history[:size]
+        self.stats["records_served"] += len(page)
+
+        return web.json_response({
+            "retcode": 0,
+            "message": "OK",
+            "data": {"page": query.get("page", "1"), "size": str(size), "list": page, "region": "prod_official_asia", "region_time_zone": 8},
+        })
+
+    def create_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get(f"{self.API_PATH}/{self.END_DEFAULT}", self._handle)
+        app.router.add_get(f"{self.API_PATH}/{self.END_COLLABORATION}", self._handle)
+        return app
+
+    async def start(self, port: int = 0) -> str:
+        """서버 시작 후 가챠 URL 반환 (port=0이면 빈 포트 자동 선택)"""
+        self._runner = web.AppRunner(self.create_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        return self.gacha_url
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "GachaAPIEmulator":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.stop()
+
+
+if __name__ == "__main__":
+    # 단독 실행: 고정 포트로 띄워 두고 앱이나 다른 도구에서 URL로 접속
+    async def serve_forever():
+        emulator = GachaAPIEmulator(latency=0.05, latency_jitter=0.05)
+        url = await emulator.start(port=8765)
+        print(f"🧪 가챠 API 에뮬레이터 실행 중: {url}")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await emulator.stop()
+
+    asyncio.run(serve_forever())
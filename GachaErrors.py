@@ -0,0 +1,57 @@
+from typing import Optional, Dict, Any
+
+
+class GachaAPIError(Exception):
+    """가챠 API 오류 기본 클래스 - 빈 목록 대신 원인을 구분할 수 있도록 retcode/reason을 함께 보관"""
+
+    def __init__(self, message: str, retcode: Optional[int] = None, reason: str = "",
+                 gacha_type: Optional[str] = None, page: Optional[int] = None):
+        super().__init__(message)
+        self.retcode = retcode
+        self.reason = reason
+        self.gacha_type = gacha_type
+        self.page = page
+
+
+class AuthExpiredError(GachaAPIError):
+    """인증키(authkey) 만료 (retcode -101) - 같은 링크로는 더 조회할 수 없음"""
+
+    RETCODE = -101
+
+
+class RateLimitedError(GachaAPIError):
+    """재시도 한도를 넘긴 요청 빈도 제한 (retcode -110, HTTP 429)"""
+
+
+class BadParamsError(GachaAPIError):
+    """링크 파라미터 오류 (retcode -111, HTTP 4xx) - 다시 보내도 결과가 같음"""
+
+
+class TransportError(GachaAPIError):
+    """네트워크/서버 오류 (타임아웃, 연결 오류, HTTP 5xx, 잘못된 응답)"""
+
+
+def error_from_result(result: Optional[Dict[str, Any]], gacha_type: Optional[str] = None,
+                      page: Optional[int] = None) -> GachaAPIError:
+    """GachaAPI._request_page의 실패 결과를 알맞은 예외로 변환"""
+    if not result:
+        return GachaAPIError("API 응답 없음", gacha_type=gacha_type, page=page)
+
+    retcode = result.get("retcode")
+    reason = result.get("reason") or "unknown"
+    location = f" (gacha_type={gacha_type}, page={page})" if gacha_type else ""
+
+    if retcode == AuthExpiredError.RETCODE:
+        error_class, message = AuthExpiredError, "인증키(authkey)가 만료되었습니다 (retcode -101)"
+    elif retcode == -110 or reason == "http_429":
+        error_class, message = RateLimitedError, f"요청 빈도 제한으로 재시도 한도 초과 ({reason})"
+    elif retcode == -111:
+        error_class, message = BadParamsError, "가챠 링크 파라미터 오류 (retcode -111)"
+    elif retcode is not None:
+        error_class, message = GachaAPIError, f"API 오류 (retcode {retcode})"
+    elif reason.startswith("http_") and not reason[5:].startswith("5"):
+        error_class, message = BadParamsError, f"잘못된 요청 ({reason})"
+    else:
+        error_class, message = TransportError, f"네트워크 오류로 재시도 한도 초과 ({reason})"
+
+    return error_class(message + location, retcode=retcode, reason=reason, gacha_type=gacha_type, page=page)
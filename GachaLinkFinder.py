@@ -1,25 +1,35 @@
-import customtkinter as ctk
-from tkinter import messagebox
-import asyncio
-import threading
-import aiohttp
-import json
 import os
-import sys
-import warnings
-import subprocess
 import re
-import winreg
-import tempfile
-import shutil
-from typing import Optional, List, Dict, Any, Tuple
+import zlib
+from typing import Optional, List, Any, Tuple, Iterator
 from urllib.parse import urlparse, parse_qs
-from collections import OrderedDict
-import time
+
+try:
+    import winreg
+except ImportError:  # Windows가 아닌 환경 (벤치마크/CI) - 레지스트리 검색만 건너뜀
+    winreg = None
+
+from LogScanState import LogScanState
 
 class GachaLinkFinder:
     """가챠 링크 검색을 담당하는 클래스"""
     
+    # 로그 역방향 스캔: 청크 크기와 청크 사이 겹침(링크 최대 길이) - 메모리 사용량은 이 두 값으로 고정
+    LOG_SCAN_CHUNK = 1024 * 1024
+    LOG_SCAN_OVERLAP = 8 * 1024
+    # 링크 매처: 고정 문자열 getGachaLog/getLdGachaLog를 먼저 찾고, 그 자리에서 앞쪽 https://와 URL 끝까지 넓힘
+    # (정규식이 모든 https:// 위치에서 시도하지 않도록) - str/bytes 모두 지원
+    GACHA_LINK_ANCHOR = {str: re.compile(r'get(?:Ld)?GachaLog'), bytes: re.compile(rb'get(?:Ld)?GachaLog')}
+    GACHA_URL_BODY = {str: re.compile(r'[^\s"\'<>\[\]{}|\\^`]*'), bytes: re.compile(rb'[^\s"\'<>\[\]{}|\\^`]*')}
+    GACHA_URL_SCHEME = {str: "https://", bytes: b"https://"}
+    GACHA_URL_TRAILING = {str: ",()", bytes: b",()"}
+    # 파일 하나에서 모을 최대 링크 후보 수 (authkey 기준) - 오래된 키는 어차피 만료됨
+    MAX_LOG_CANDIDATES = 5
+    # 이어서 스캔하기 전에 지난번 끝 위치 바로 앞 바이트가 그대로인지 확인할 길이 (같은 파일을 비우고 다시 쓴 경우 감지)
+    LOG_TAIL_CHECK = 1024
+    # UTF-16 BOM별 ASCII 글자의 실제 바이트 위치 (LE: 짝수, BE: 홀수) - BOM이 없으면 1바이트 단위
+    UTF16_STRIDE_OFFSET = {b"\xff\xfe": 0, b"\xfe\xff": 1}
+    
     @staticmethod
     def get_log_paths() -> List[str]:
         """가능한 로그 파일 경로들 반환"""
@@ -33,104 +43,225 @@ class GachaLinkFinder:
         ]
     
     @staticmethod
-    def extract_gacha_patterns(content: str) -> Optional[str]:
-        """텍스트에서 가챠 링크 패턴 추출"""
-        patterns = [
-            r'https://[^\s"\'<>\[\]{}|\\^`]*getGachaLog[^\s"\'<>\[\]{}|\\^`]*',
-            r'https://[^\s]*?public-operation-hkrpg[^\s]*?getGachaLog[^\s]*',
-            r'https://[^\s]*?hkrpg-api[^\s]*?getGachaLog[^\s]*',
-            r'https://[^\s]*?api-os-takumi[^\s]*?getGachaLog[^\s]*',
-            r'https://[^\s]*?hoyoverse[^\s]*?getGachaLog[^\s]*',
-            r'https://[^\s]*?mihoyo[^\s]*?getGachaLog[^\s]*'
+    def get_registry_paths() -> List[Tuple[int, str]]:
+        """가챠 링크가 저장될 수 있는 레지스트리 키들 반환"""
+        if winreg is None:
+            return []
+        return [
+            (winreg.HKEY_CURRENT_USER, r"Software\miHoYo\崩坏：星穹铁道"),
+            (winreg.HKEY_CURRENT_USER, r"Software\miHoYo\Honkai: Star Rail"),
+            (winreg.HKEY_CURRENT_USER, r"Software\Cognosphere\Star Rail"),
+            (winreg.HKEY_CURRENT_USER, r"Software\HoYoverse\Star Rail"),
         ]
+    
+    @staticmethod
+    def authkey_of(link: str) -> Optional[str]:
+        """링크의 authkey 파라미터 - 없으면 None (중복 제거할 때는 authkey_of(link) or link를 키로 씀)"""
+        return (parse_qs(urlparse(link).query).get("authkey") or [None])[0]
+    
+    @staticmethod
+    def unique_by_authkey(links: List[str]) -> List[str]:
+        """authkey가 같은 링크는 처음 나온 것만 남김 (순서 유지, authkey 없는 링크는 URL 기준)"""
+        seen = set()
+        unique = []
+        for link in links:
+            if not link:
+                continue
+            authkey = GachaLinkFinder.authkey_of(link) or link
+            if authkey in seen:
+                continue
+            seen.add(authkey)
+            unique.append(link)
+        return unique
+    
+    @staticmethod
+    def link_timestamp(link: str, default: float = 0.0) -> float:
+        """링크에 들어 있는 timestamp 파라미터(발급 시각, 초) - 없으면 default (보통 출처 파일의 수정 시각)"""
+        value = (parse_qs(urlparse(link).query).get("timestamp") or [""])[0]
+        try:
+            timestamp = float(value)
+        except ValueError:
+            return default
+        # 밀리초 단위로 들어 있는 경우
+        return timestamp / 1000 if timestamp > 1e11 else timestamp
+    
+    @classmethod
+    def iter_gacha_links(cls, content, max_prefix: Optional[int] = None) -> Iterator[Tuple[int, Any]]:
+        """텍스트(str/bytes/mmap)를 한 번만 훑어서 가챠 링크를 앞에서부터 (시작 위치, 링크)로 반환
         
-        for pattern in patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            if matches:
-                latest_link = matches[-1].strip('",\'()[]{}')
-                if latest_link and 'getGachaLog' in latest_link:
-                    return latest_link
+        max_prefix: 링크 시작(https://)부터 getGachaLog까지 허용할 최대 길이 (기본 LOG_SCAN_OVERLAP)
+        """
+        kind = str if isinstance(content, str) else bytes
+        body = cls.GACHA_URL_BODY[kind]
+        scheme = cls.GACHA_URL_SCHEME[kind]
+        max_prefix = max_prefix or cls.LOG_SCAN_OVERLAP
+        last_end = -1
         
-        # 수동 검색
-        lines = content.split('\n')
-        for line in lines:
-            if 'getGachaLog' in line and 'https://' in line:
-                url_match = re.search(r'https://[^\s"\'<>\[\]{}|\\^`]*', line)
-                if url_match:
-                    url = url_match.group(0).strip('",\'()[]{}')
-                    if url and 'getGachaLog' in url:
-                        return url
+        for anchor in cls.GACHA_LINK_ANCHOR[kind].finditer(content):
+            if anchor.start() < last_end:
+                # 이미 찾은 링크 안에 또 나온 getGachaLog
+                continue
+            start = content.rfind(scheme, max(0, anchor.start() - max_prefix), anchor.start())
+            if start < 0 or body.match(content, start).end() < anchor.end():
+                # https://와 getGachaLog 사이에 공백/따옴표가 있으면 같은 URL이 아님
+                continue
+            end = body.match(content, anchor.end()).end()
+            last_end = end
+            yield start, content[start:end].rstrip(cls.GACHA_URL_TRAILING[kind])
+    
+    @classmethod
+    def scan_log_backwards(cls, log_path: str, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+        """로그를 끝에서부터 고정 크기 청크로 거꾸로 읽으며 가챠 링크를 최신 것부터 (바이트 위치, 링크)로 반환
         
+        파일 전체를 읽거나 디코딩하지 않고 찾은 링크 부분만 디코딩한다. start/end로 스캔 구간을 제한할 수 있다.
+        utf-8/cp949/latin-1은 링크(ASCII) 바이트가 같으므로 그대로, UTF-16(BOM)은 2바이트 간격으로 건너뛰며 찾는다.
+        """
+        with open(log_path, "rb") as f:
+            stride_offset = cls.UTF16_STRIDE_OFFSET.get(f.read(2))
+            width = 1 if stride_offset is None else 2
+            
+            f.seek(0, os.SEEK_END)
+            end = f.tell() if end is None else min(end, f.tell())
+            start -= start % width
+            end -= end % width
+            
+            pos = end
+            tail = b""
+            while pos > start:
+                chunk_start = max(start, pos - cls.LOG_SCAN_CHUNK)
+                f.seek(chunk_start)
+                chunk = f.read(pos - chunk_start)
+                # 청크 경계에 걸친 링크도 온전히 보이도록 바로 뒤 청크의 앞부분을 붙여서 검색
+                window = chunk + tail
+                if width == 2:
+                    window = window[stride_offset::2]
+                chunk_length = len(chunk) // width
+                matches = [(offset, link) for offset, link in cls.iter_gacha_links(window) if offset < chunk_length]
+                for offset, link in reversed(matches):
+                    yield chunk_start + offset * width, link.decode("ascii", errors="ignore")
+                tail = (chunk + tail)[:cls.LOG_SCAN_OVERLAP * width]
+                pos = chunk_start
+    
+    @classmethod
+    def find_last_gacha_link(cls, log_path: str) -> Optional[str]:
+        """로그에서 가장 최근 가챠 링크 (뒤에서부터 처음 만나는 링크에서 바로 멈춤)"""
+        for _, link in cls.scan_log_backwards(log_path):
+            return link
         return None
-
-def get_gacha_link_from_logs() -> Optional[str]:
-    """게임 로그 파일에서 가챠 링크 추출"""
-    finder = GachaLinkFinder()
     
-    for log_path in finder.get_log_paths():
-        if not os.path.exists(log_path):
-            continue
-            
-        print(f"로그 파일 확인: {log_path}")
-        file_size = os.path.getsize(log_path)
-        print(f"파일 크기: {file_size:,} bytes")
+    @classmethod
+    def _tail_checksum(cls, log_path: str, offset: int) -> int:
+        """offset 바로 앞 LOG_TAIL_CHECK 바이트의 CRC32"""
+        with open(log_path, "rb") as f:
+            start = max(0, offset - cls.LOG_TAIL_CHECK)
+            f.seek(start)
+            return zlib.crc32(f.read(offset - start))
+    
+    @classmethod
+    def _link_runs_to_end(cls, log_path: str, offset: int, end: int) -> bool:
+        """offset에서 시작한 링크가 end까지 끊기지 않고 이어지는지 - 게임이 아직 쓰는 중이라 잘렸을 수 있는 링크"""
+        with open(log_path, "rb") as f:
+            stride_offset = cls.UTF16_STRIDE_OFFSET.get(f.read(2))
+            width = 1 if stride_offset is None else 2
+            if end - offset > cls.LOG_SCAN_OVERLAP * width:
+                # 스캔 겹침보다 긴 링크는 어차피 청크 경계에서 온전히 찾지 못하므로 검사하지 않음
+                return False
+            f.seek(offset)
+            data = f.read(end - offset)
+        if width == 2:
+            data = data[stride_offset::2]
+        return cls.GACHA_URL_BODY[bytes].match(data).end() == len(data)
+    
+    @classmethod
+    def find_gacha_links(cls, log_path: str, limit: Optional[int] = None,
+                         scan_state: Optional[LogScanState] = None) -> List[str]:
+        """로그의 가챠 링크를 최신 것부터 authkey 기준으로 중복 없이 최대 limit개
         
-        if file_size == 0:
-            continue
+        scan_state가 있으면 지난번에 스캔한 위치 이후로 추가된 부분만 스캔하고 이전 결과와 합친다.
+        파일이 줄었거나, 다른 파일로 바뀌었거나, 지난번 끝부분 내용이 달라졌으면 처음부터 다시 스캔한다.
+        """
+        limit = limit or cls.MAX_LOG_CANDIDATES
+        stat = os.stat(log_path)
+        start = 0
+        previous: List[str] = []
         
-        encodings = ['utf-8', 'utf-16', 'cp949', 'latin-1']
+        entry = scan_state.find(log_path, stat) if scan_state else None
+        if entry:
+            # 지난번 결과로 충분한지: limit개 이상 찾았거나, 끝까지 스캔했는데도 지난번 limit보다 적었던 경우
+            found, previous_limit = len(entry["links"]), entry.get("limit", 0)
+            if not (found >= limit or previous_limit >= limit or found < previous_limit):
+                entry = None
+        if entry and cls._tail_checksum(log_path, entry["offset"]) == entry.get("tail_crc"):
+            previous = entry["links"]
+            if stat.st_size == entry["offset"]:
+                start = stat.st_size
+            else:
+                # 지난번 끝에서 쓰다 만 링크가 있었을 수 있으므로 링크 최대 길이만큼 겹쳐서 스캔
+                start = max(0, entry["offset"] - cls.LOG_SCAN_OVERLAP)
         
-        for encoding in encodings:
-            try:
-                with open(log_path, 'r', encoding=encoding, errors='ignore') as f:
-                    content = f.read()
-                    
-                if 'getGachaLog' not in content:
-                    continue
-                    
-                print(f"✅ getGachaLog 발견 ({encoding})")
-                link = finder.extract_gacha_patterns(content)
-                if link:
-                    print(f"✅ 링크 추출 성공: {link[:100]}...")
-                    return link
-                    
-            except Exception as e:
-                print(f"❌ {encoding} 인코딩 실패: {e}")
+        links = []
+        seen = set()
+        scanned_to = stat.st_size
+        for index, (offset, link) in enumerate(cls.scan_log_backwards(log_path, start=start, end=stat.st_size)):
+            if index == 0 and cls._link_runs_to_end(log_path, offset, stat.st_size):
+                # 파일 끝에서 잘린 링크는 저장하지 않고, 다음 스캔이 이 링크 시작부터 다시 보도록 위치를 되돌림
+                scanned_to = offset
                 continue
+            authkey = cls.authkey_of(link) or link
+            if authkey in seen:
+                continue
+            seen.add(authkey)
+            links.append(link)
+            if len(links) >= limit:
+                break
+        links = cls.unique_by_authkey(links + previous)[:limit]
+        
+        if scan_state is not None:
+            scan_state.update(log_path, stat, scanned_to, cls._tail_checksum(log_path, scanned_to), links, limit)
+        return links
     
-    print("❌ 로그에서 가챠 링크를 찾을 수 없습니다")
-    return None
+    @classmethod
+    def extract_gacha_patterns(cls, content: str) -> Optional[str]:
+        """텍스트에서 가장 최근(뒤쪽) 가챠 링크 추출 - 미리 컴파일한 매처로 한 번만 훑음"""
+        latest = None
+        for _, link in cls.iter_gacha_links(content):
+            latest = link
+        return latest
 
-def get_gacha_link_from_registry() -> Optional[str]:
-    """레지스트리에서 가챠 링크 추출"""
-    registry_paths = [
-        (winreg.HKEY_CURRENT_USER, r"Software\miHoYo\崩坏：星穹铁道"),
-        (winreg.HKEY_CURRENT_USER, r"Software\miHoYo\Honkai: Star Rail"),
-        (winreg.HKEY_CURRENT_USER, r"Software\Cognosphere\Star Rail"),
-        (winreg.HKEY_CURRENT_USER, r"Software\HoYoverse\Star Rail"),
-    ]
+def get_gacha_link_candidates_from_registry() -> List[Tuple[float, str]]:
+    """레지스트리에서 (시각, 링크) 후보 추출 - 시각은 링크의 timestamp 파라미터, 없으면 레지스트리 키 수정 시각"""
+    candidates = []
     
-    for hkey, subkey in registry_paths:
+    for hkey, subkey in GachaLinkFinder.get_registry_paths():
         try:
             with winreg.OpenKey(hkey, subkey) as key:
-                print(f"레지스트리 키 확인: {subkey}")
-                
+                # 마지막 수정 시각: 1601-01-01부터 100ns 단위
+                modified = winreg.QueryInfoKey(key)[2] / 1e7 - 11644473600
                 i = 0
                 while True:
                     try:
                         name, value, reg_type = winreg.EnumValue(key, i)
                         if isinstance(value, str) and 'getGachaLog' in value:
-                            print(f"✅ 레지스트리 링크 발견: {value[:100]}...")
-                            return value
+                            candidates.append((GachaLinkFinder.link_timestamp(value, modified), value))
                         i += 1
                     except WindowsError:
                         break
-                        
         except (FileNotFoundError, PermissionError):
             continue
         except Exception as e:
             print(f"레지스트리 오류 {subkey}: {e}")
             continue
     
-    print("❌ 레지스트리에서 링크를 찾을 수 없습니다")
-    return None
\ No newline at end of file
+    return candidates
+
+def get_gacha_link_candidates_from_log(log_path: str, scan_state: Optional[LogScanState] = None) -> List[Tuple[float, str]]:
+    """로그 파일 하나에서 (시각, 링크) 후보 추출 - 시각은 링크의 timestamp 파라미터, 없으면 로그 수정 시각"""
+    try:
+        if not os.path.exists(log_path) or os.path.getsize(log_path) == 0:
+            return []
+        mtime = os.path.getmtime(log_path)
+        links = GachaLinkFinder.find_gacha_links(log_path, scan_state=scan_state)
+    except OSError as e:
+        print(f"❌ 로그 읽기 실패: {e}")
+        return []
+    return [(GachaLinkFinder.link_timestamp(link, mtime), link) for link in links]
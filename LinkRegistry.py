@@ -0,0 +1,103 @@
+import hashlib
+import json
+import os
+import time
+from typing import Optional, Dict, Any
+from urllib.parse import urlparse, parse_qs
+
+from GachaLinkFinder import GachaLinkFinder
+
+
+class LinkRegistry:
+    """한 번 본 가챠 링크의 검증 결과를 authkey 해시 기준으로 기억하는 로컬 저장소
+
+    - 이미 -101(인증키 만료)로 확인된 링크는 네트워크 요청 없이 바로 거절
+    - 최근에 검증에 성공한 링크는 정해진 시간 안에서 재검증 생략
+    """
+
+    DEFAULT_PATH = "link_registry.json"
+    AUTH_EXPIRED_RETCODE = -101
+    # 이보다 오래된 항목은 저장할 때 정리 (authkey는 하루 안에 만료됨)
+    RETENTION = 7 * 24 * 3600
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+
+    @staticmethod
+    def authkey_hash(gacha_url: str) -> Optional[str]:
+        """링크의 authkey를 해시한 키 (authkey 원문은 저장하지 않음)"""
+        authkey = GachaLinkFinder.authkey_of(gacha_url)
+        if not authkey:
+            return None
+        return hashlib.sha256(authkey.encode("utf-8")).hexdigest()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, "r", encoding="utf-8") as f:
+                    entries = json.load(f)
+                if isinstance(entries, dict):
+                    return entries
+        except Exception as e:
+            print(f"링크 기록 로드 중 오류: {e}")
+        return {}
+
+    def _save(self) -> None:
+        try:
+            now = time.time()
+            self._entries = {
+                key: entry for key, entry in self._entries.items()
+                if now - max(entry.get("first_seen", 0), entry.get("last_validated") or 0) < self.RETENTION
+            }
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            print(f"링크 기록 저장 중 오류: {e}")
+
+    def get(self, gacha_url: str) -> Optional[Dict[str, Any]]:
+        key = self.authkey_hash(gacha_url)
+        return self._entries.get(key) if key else None
+
+    def touch(self, gacha_url: str) -> None:
+        """처음 본 링크면 first_seen과 링크 메타데이터(authkey_ver, timestamp 등) 기록"""
+        key = self.authkey_hash(gacha_url)
+        if not key or key in self._entries:
+            return
+        params = parse_qs(urlparse(gacha_url).query)
+        self._entries[key] = {
+            "first_seen": time.time(),
+            "host": urlparse(gacha_url).netloc,
+            "authkey_ver": (params.get("authkey_ver") or [None])[0],
+            "timestamp": (params.get("timestamp") or [None])[0],
+            "last_validated": None,
+            "last_result": None,
+            "last_retcode": None,
+        }
+        self._save()
+
+    def record_validation(self, gacha_url: str, is_valid: bool, retcode: Optional[int] = None) -> None:
+        """검증(또는 실제 조회) 결과 기록 - 네트워크/속도 제한 오류처럼 판단이 안 된 결과는 기록하지 않음"""
+        key = self.authkey_hash(gacha_url)
+        if not key:
+            return
+        if not is_valid and retcode is None:
+            return
+        self.touch(gacha_url)
+        entry = self._entries[key]
+        entry["last_validated"] = time.time()
+        entry["last_result"] = "valid" if is_valid else "expired" if retcode == self.AUTH_EXPIRED_RETCODE else "invalid"
+        entry["last_retcode"] = 0 if is_valid else retcode
+        self._save()
+
+    def is_known_expired(self, gacha_url: str) -> bool:
+        """이미 인증키 만료로 확인된 링크인지 (만료된 authkey는 다시 살아나지 않음)"""
+        entry = self.get(gacha_url)
+        return bool(entry) and entry.get("last_retcode") == self.AUTH_EXPIRED_RETCODE
+
+    def is_recently_valid(self, gacha_url: str, window: float) -> bool:
+        """window(초) 안에 검증에 성공한 링크인지"""
+        entry = self.get(gacha_url)
+        if not entry or entry.get("last_result") != "valid" or not entry.get("last_validated"):
+            return False
+        return time.time() - entry["last_validated"] < window
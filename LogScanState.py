@@ -0,0 +1,71 @@
+import json
+import os
+import threading
+import time
+from typing import Optional, Dict, Any, List
+
+
+class LogScanState:
+    """로그 파일별로 어디까지 스캔했는지 기억하는 저장소 - 다음 검색에서는 새로 추가된 부분만 스캔
+
+    로그 경로마다 {"inode", "size", "mtime", "offset", "tail_crc", "limit", "links", "scanned_at"}를 저장한다.
+    links는 이미 같은 PC의 Player.log에 평문으로 남아 있는 링크를 그대로 기억하는 것.
+    로그 파일별 스캔을 여러 스레드에서 동시에 돌려도 되도록 읽기/쓰기는 잠금 안에서 한다.
+    """
+
+    DEFAULT_PATH = "log_scan_state.json"
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, "r", encoding="utf-8") as f:
+                    entries = json.load(f)
+                if isinstance(entries, dict):
+                    return entries
+        except Exception as e:
+            print(f"로그 스캔 상태 로드 중 오류: {e}")
+        return {}
+
+    def save(self) -> None:
+        try:
+            with self._lock:
+                snapshot = json.dumps(self._entries, ensure_ascii=False, indent=2)
+            with open(self.path, "w", encoding="utf-8") as f:
+                f.write(snapshot)
+        except Exception as e:
+            print(f"로그 스캔 상태 저장 중 오류: {e}")
+
+    def find(self, log_path: str, stat: os.stat_result) -> Optional[Dict[str, Any]]:
+        """이어서 스캔할 수 있는 이전 상태 - 파일이 줄었거나 다른 파일로 바뀌었으면 None (전체 스캔)
+
+        Player.log가 Player-prev.log로 이름이 바뀐 경우에는 같은 inode로 기록된 상태를 이어받는다.
+        """
+        with self._lock:
+            entry = self._entries.get(log_path)
+            if entry and entry.get("inode") == stat.st_ino and stat.st_size >= entry.get("offset", 0):
+                return entry
+            if stat.st_ino:
+                for path, other in self._entries.items():
+                    if path != log_path and other.get("inode") == stat.st_ino and stat.st_size >= other.get("offset", 0):
+                        return other
+            return None
+
+    def update(self, log_path: str, stat: os.stat_result, offset: int, tail_crc: int,
+               links: List[str], limit: int) -> None:
+        entry = {
+            "inode": stat.st_ino,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "offset": offset,
+            "tail_crc": tail_crc,
+            "limit": limit,
+            "links": links,
+            "scanned_at": time.time(),
+        }
+        with self._lock:
+            self._entries[log_path] = entry
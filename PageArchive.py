@@ -0,0 +1,141 @@
+"""API 원본 페이지 아카이브 - 받은 JSON 페이지를 압축된 추가 전용 파일에 쌓고, 나중에 네트워크 없이 재생
+
+사용 예 (아카이브에서 data.csv 다시 만들기):
+    python PageArchive.py raw_pages.jsonl.gz --out rebuilt
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import time
+import zlib
+from typing import Optional, List, Dict, Any, Tuple
+
+# (uid, gacha_type, endpoint)
+RecordKey = Tuple[str, str, str]
+
+
+class PageArchive:
+    """gzip JSON Lines 형식의 추가 전용 페이지 아카이브
+
+    한 줄 = 페이지 하나: {"uid", "gacha_type", "endpoint", "end_id", "lang", "size", "archived_at", "response"}
+    파일을 열 때마다 gzip 멤버가 하나씩 이어 붙으며, 비정상 종료로 끝이 잘린 멤버는 읽을 때 무시한다.
+    재생할 때는 페이지 경계 대신 배너/엔드포인트별로 합친 기록에서 end_id 커서대로 잘라서 제공한다.
+    """
+
+    DEFAULT_PATH = "raw_pages.jsonl.gz"
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        self._writer = None
+        self._records: Optional[Dict[RecordKey, List[Dict[str, Any]]]] = None
+
+    def append(self, uid: str, gacha_type: str, endpoint: str, end_id: str, response: Dict[str, Any],
+               lang: str = "", size: str = "") -> None:
+        """받은 원본 페이지 한 개 추가 (페이지마다 flush해서 중간에 꺼져도 앞부분은 남음)"""
+        if self._writer is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            self._writer = gzip.open(self.path, "at", encoding="utf-8")
+        line = {
+            "uid": uid,
+            "gacha_type": gacha_type,
+            "endpoint": endpoint,
+            "end_id": end_id,
+            "lang": lang,
+            "size": size,
+            "archived_at": time.time(),
+            "response": response,
+        }
+        self._writer.write(json.dumps(line, ensure_ascii=False) + "\n")
+        self._writer.flush()
+        self._records = None
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def iter_entries(self):
+        """아카이브의 모든 페이지를 기록된 순서대로 반환 (잘린 꼬리는 건너뜀)"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        # 쓰는 도중에 끊긴 마지막 줄
+                        continue
+        except (EOFError, gzip.BadGzipFile, zlib.error) as e:
+            print(f"⚠️ 아카이브 끝부분 손상 - 앞부분만 사용: {e}")
+
+    @staticmethod
+    def _id_value(record_id: Any) -> int:
+        try:
+            return int(record_id)
+        except (TypeError, ValueError):
+            return 0
+
+    def load_records(self) -> Dict[RecordKey, List[Dict[str, Any]]]:
+        """(uid, gacha_type, endpoint) → 아카이브된 모든 기록 (id 기준 중복 제거, 최신순)
+
+        페이지를 end_id로 찾지 않고 기록 단위로 합치므로, 증분 조회가 같은 end_id="0" 페이지를
+        새로 받아도 예전 전체 조회에서 받은 과거 기록과 이어진다.
+        """
+        if self._records is None:
+            merged: Dict[RecordKey, Dict[str, Dict[str, Any]]] = {}
+            for entry in self.iter_entries():
+                key = (str(entry.get("uid", "")), str(entry.get("gacha_type", "")), str(entry.get("endpoint", "")))
+                records = merged.setdefault(key, {})
+                for record in ((entry.get("response") or {}).get("data") or {}).get("list") or []:
+                    # 같은 id는 나중에 받은 기록이 우선
+                    records[str(record.get("id"))] = record
+            self._records = {
+                key: sorted(records.values(), key=lambda record: self._id_value(record.get("id")), reverse=True)
+                for key, records in merged.items()
+            }
+        return self._records
+
+    def uids(self) -> List[str]:
+        return sorted({key[0] for key in self.load_records() if key[0]})
+
+    def replay_page(self, uid: str, gacha_type: str, endpoint: str, end_id: str, size: int) -> Dict[str, Any]:
+        """end_id보다 작은 id의 기록을 최신순으로 size개 - 실제 API와 같은 응답 형식"""
+        records = self.load_records().get((uid, gacha_type, endpoint), [])
+        if end_id and end_id != "0":
+            limit = self._id_value(end_id)
+            records = [record for record in records if self._id_value(record.get("id")) < limit]
+        return {"retcode": 0, "message": "OK", "data": {"size": str(size), "list": records[:size]}}
+
+
+async def rebuild_from_archive(archive_path: str, out_dir: str, lang: str = "ko") -> None:
+    """아카이브만으로 계정별 data.csv 재생성 (네트워크/속도 제한 없이 디스크 속도로)"""
+    from GachaAPI import GachaAPI
+    from BatchSync import AccountStore, BatchSync, BANNER_IDS
+
+    archive = PageArchive(archive_path)
+    started = time.perf_counter()
+    for uid in archive.uids():
+        rows = []
+        api = GachaAPI(f"replay://archive/{GachaAPI.END_DEFAULT}", replay_archive=archive, replay_uid=uid)
+        for banner_id in BANNER_IDS:
+            async for page in api.iter_pages(banner_id, lang):
+                rows.extend(BatchSync._to_row(record, banner_id) for record in page)
+        added = AccountStore(out_dir, uid).merge_rows(rows)
+        print(f"✅ uid={uid}: {len(rows)}개 기록 재생 → {added}개 저장")
+    print(f"📦 재생 완료: {time.perf_counter() - started:.2f}초")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="원본 페이지 아카이브에서 data.csv 재생성")
+    parser.add_argument("archive", help="원본 페이지 아카이브 (.jsonl.gz)")
+    parser.add_argument("--out", default="rebuilt", help="계정별 data.csv를 저장할 폴더")
+    parser.add_argument("--lang", default="ko", help="아카이브할 때 사용한 요청 언어")
+    args = parser.parse_args()
+    asyncio.run(rebuild_from_archive(args.archive, args.out, args.lang))
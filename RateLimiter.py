@@ -0,0 +1,46 @@
+import asyncio
+import time
+
+
+class RateLimiter:
+    """토큰 버킷 방식의 비동기 요청 속도 제한기 - 여러 배너 조회가 하나를 공유"""
+
+    DEFAULT_REQUESTS_PER_SECOND = 3.0
+    DEFAULT_BURST = 5
+
+    def __init__(self, requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND, burst: int = DEFAULT_BURST):
+        if requests_per_second <= 0:
+            raise ValueError("requests_per_second는 0보다 커야 합니다")
+        self.rate = float(requests_per_second)
+        self.capacity = max(1, int(burst))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+        # 대기 통계 (토큰 부족으로 기다린 시간)
+        self.total_wait = 0.0
+        self.acquired = 0
+
+    def _refill(self) -> None:
+        """경과 시간만큼 토큰 보충 (최대 burst까지)"""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """토큰 1개를 얻을 때까지 대기하고, 기다린 시간(초)을 반환"""
+        waited = 0.0
+        # 락을 쥔 채로 기다려서 대기 순서(FIFO)를 보장
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    break
+                delay = (1 - self._tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+        self.total_wait += waited
+        self.acquired += 1
+        return waited
@@ -0,0 +1,81 @@
+import json
+import os
+import time
+from typing import Optional, List, Dict, Any
+
+
+class SyncCheckpoint:
+    """배너별 페이지네이션 체크포인트 - 조회 도중 앱이 꺼져도 다음 실행에서 이어서 조회
+
+    배너마다 JSON Lines 파일 하나를 두고, 페이지를 받을 때마다
+    {"endpoint", "end_id", "page", "uid", "lang", "records"} 한 줄을 덧붙인다 (전체를 다시 쓰지 않음).
+    마지막 줄의 커서(endpoint, end_id, page)가 이어서 조회할 위치다.
+    """
+
+    DEFAULT_DIR = "sync_checkpoints"
+
+    def __init__(self, directory: str = DEFAULT_DIR):
+        self.directory = directory
+
+    def _path(self, banner_id: str) -> str:
+        return os.path.join(self.directory, f"banner_{banner_id}.jsonl")
+
+    def append(self, banner_id: str, cursor: Dict[str, Any], records: List[Dict[str, Any]], lang: str) -> None:
+        """받은 페이지와 다음 커서를 체크포인트에 추가"""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            line = {
+                "endpoint": cursor.get("endpoint"),
+                "end_id": cursor.get("end_id"),
+                "page": cursor.get("page"),
+                "uid": str(records[0].get("uid", "")) if records else "",
+                "lang": lang,
+                "saved_at": time.time(),
+                "records": records,
+            }
+            # fsync는 하지 않음 - 페이지마다 이벤트 루프를 디스크 대기로 막지 않도록.
+            # 앱이 강제 종료돼도 flush된 내용은 OS에 남고, 쓰다 만 마지막 줄은 load에서 건너뜀
+            with open(self._path(banner_id), "a", encoding="utf-8") as f:
+                f.write(json.dumps(line, ensure_ascii=False) + "\n")
+        except Exception as e:
+            print(f"체크포인트 저장 실패 (배너 {banner_id}): {e}")
+
+    def load(self, banner_id: str) -> Optional[Dict[str, Any]]:
+        """체크포인트 로드 - {"cursor", "uid", "lang", "records"} 또는 None"""
+        path = self._path(banner_id)
+        if not os.path.exists(path):
+            return None
+
+        records = []
+        last = None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # 쓰는 도중에 꺼져서 잘린 마지막 줄
+                        break
+                    records.extend(entry.get("records", []))
+                    last = entry
+        except Exception as e:
+            print(f"체크포인트 로드 실패 (배너 {banner_id}): {e}")
+            return None
+
+        if not last:
+            return None
+        return {
+            "cursor": {"endpoint": last.get("endpoint"), "end_id": last.get("end_id"), "page": last.get("page")},
+            "uid": last.get("uid", ""),
+            "lang": last.get("lang", "ko"),
+            "records": records,
+        }
+
+    def clear(self, banner_id: str) -> None:
+        """배너 조회가 끝나면 체크포인트 삭제"""
+        try:
+            path = self._path(banner_id)
+            if os.path.exists(path):
+                os.remove(path)
+        except Exception as e:
+            print(f"체크포인트 삭제 실패 (배너 {banner_id}): {e}")
@@ -0,0 +1,206 @@
+"""웹캐시 파서 검증/벤치마크 - 합성 Chromium blockfile 캐시에서 가챠 링크 항목 조회 결과와 읽은 블록 수 확인
+
+LRU 리스트를 따라가는 기본 경로와, LRU 리스트 head를 지운 캐시에서 해시 테이블 전체(iter_entries)를 훑는
+대체 경로가 같은 링크를 최신순으로 돌려주는지 확인한다. 결과가 다르면 종료 코드 1.
+
+사용 예:
+    python benchmark_cache_scan.py
+    python benchmark_cache_scan.py --entries 50000 --gacha-ratio 0.01
+"""
+import argparse
+import os
+import random
+import struct
+import tempfile
+import time
+from typing import List, Tuple
+
+from ChromiumCacheParser import (
+    ChromiumCacheParser, find_gacha_entries, INDEX_MAGIC, BLOCK_MAGIC, INDEX_HEADER_SIZE, INDEX_TABLE_LEN_OFFSET,
+    LRU_HEADS_OFFSET, LRU_LIST_COUNT, LRU_LIVE_LISTS, BLOCK_HEADER_SIZE, ADDR_INITIALIZED, ADDR_FILE_TYPE_SHIFT,
+    ADDR_NUM_BLOCKS_SHIFT, ADDR_FILE_SELECTOR_SHIFT, ENTRY_KEY_OFFSET, ENTRY_NORMAL, WINDOWS_EPOCH_OFFSET,
+)
+
+GACHA_URL = ("https://public-operation-hkrpg-sg.hoyoverse.com/common/gacha_record/api/getGachaLog"
+             "?authkey_ver=1&sign_type=2&lang=ko&game_biz=hkrpg_global&authkey={authkey}&gacha_type=11&page=1")
+COLLAB_URL = ("https://public-operation-hkrpg-sg.hoyoverse.com/common/gacha_record/api/getLdGachaLog"
+              "?authkey_ver=1&authkey={authkey}&lang=ko&pad={pad}")
+ASSET_URL = "https://webstatic.hoyoverse.com/upload/op-public/{n}.js"
+
+RANKINGS_FILE, ENTRY_FILE = 0, 1
+RANKINGS_TYPE, BLOCK_256_TYPE = 1, 2
+RANKINGS_NODE_SIZE = 36
+ENTRY_BLOCK_SIZE = 256
+ENTRY_MAX_BLOCKS = 4
+INDEX_VERSION = 0x30000
+TABLE_LEN = 0x10000
+DELETED_LIST = 4
+ENTRY_EVICTED = 1
+
+
+def block_addr(file_type: int, file_number: int, start_block: int, num_blocks: int = 1) -> int:
+    return (ADDR_INITIALIZED | (file_type << ADDR_FILE_TYPE_SHIFT) | ((num_blocks - 1) << ADDR_NUM_BLOCKS_SHIFT)
+            | (file_number << ADDR_FILE_SELECTOR_SHIFT) | start_block)
+
+
+def to_chromium_time(unix_time: float) -> int:
+    return int((unix_time + WINDOWS_EPOCH_OFFSET) * 1_000_000)
+
+
+def block_file(num_blocks: int, block_size: int) -> bytearray:
+    data = bytearray(BLOCK_HEADER_SIZE + num_blocks * block_size)
+    struct.pack_into("<I", data, 0, BLOCK_MAGIC)
+    return data
+
+
+def write_synthetic_cache(cache_dir: str, count: int, gacha_ratio: float, seed: int = 1) -> List[Tuple[str, float, int]]:
+    """count개 항목의 blockfile 캐시 생성 - (키, 마지막 사용 시각, LRU 리스트) 목록 반환
+
+    가장 최근에 사용된 가챠 링크 하나는 지워진 항목(DELETED 리스트, state=EVICTED)으로 넣어서 결과에 나오면 안 된다.
+    """
+    rng = random.Random(seed)
+    entries = []
+    for n in range(count):
+        roll = rng.random()
+        if roll < gacha_ratio * 0.7:
+            key = f"1/0/_dk_https://hoyoverse.com https://hoyoverse.com {GACHA_URL.format(authkey=f'key{n}')}"
+        elif roll < gacha_ratio:
+            # 블록 4개를 넘는 긴 키는 f_xxxxxx 외부 파일에 저장됨
+            key = "1/0/" + COLLAB_URL.format(authkey=f"ld{n}", pad="x" * rng.choice([10, 600, 1200]))
+        else:
+            key = "1/0/" + ASSET_URL.format(n=n)
+        entries.append((key, 1.7e9 + rng.random() * 1e6, rng.randrange(LRU_LIVE_LISTS)))
+    entries.append(("1/0/" + GACHA_URL.format(authkey="EVICTED"), 1.8e9, DELETED_LIST))
+
+    block_count = 0
+    external = 0
+    layout = []
+    entry_blocks = bytearray()
+    for index, (key, last_used, list_index) in enumerate(entries):
+        raw = key.encode()
+        long_key = 0
+        num_blocks = -(-(ENTRY_KEY_OFFSET + len(raw) + 1) // ENTRY_BLOCK_SIZE)
+        if num_blocks > ENTRY_MAX_BLOCKS:
+            external += 1
+            with open(os.path.join(cache_dir, f"f_{external:06x}"), "wb") as f:
+                f.write(raw)
+            long_key = ADDR_INITIALIZED | external
+            num_blocks = 1
+        layout.append((block_addr(BLOCK_256_TYPE, ENTRY_FILE, block_count, num_blocks),
+                       block_addr(RANKINGS_TYPE, RANKINGS_FILE, index), raw, long_key, num_blocks))
+        block_count += num_blocks
+
+    # 해시 테이블: 같은 버킷은 EntryStore.next로 연결
+    table = [0] * TABLE_LEN
+    next_addr = {}
+    for entry_addr, *_ in layout:
+        bucket = rng.randrange(TABLE_LEN)
+        next_addr[entry_addr] = table[bucket]
+        table[bucket] = entry_addr
+
+    for (entry_addr, rankings_addr, raw, long_key, num_blocks), (_, last_used, list_index) in zip(layout, entries):
+        block = bytearray(num_blocks * ENTRY_BLOCK_SIZE)
+        state = ENTRY_EVICTED if list_index == DELETED_LIST else ENTRY_NORMAL
+        struct.pack_into("<IIIiiiQiI", block, 0, 0, next_addr[entry_addr], rankings_addr, 0, 0, state,
+                         to_chromium_time(last_used - 100), len(raw), long_key)
+        if not long_key:
+            block[ENTRY_KEY_OFFSET:ENTRY_KEY_OFFSET + len(raw)] = raw
+        entry_blocks += block
+    data_1 = block_file(0, ENTRY_BLOCK_SIZE) + entry_blocks
+
+    # LRU 리스트: 리스트마다 최근 사용한 항목부터 RankingsNode.next로 연결
+    data_0 = block_file(len(entries), RANKINGS_NODE_SIZE)
+    heads = [0] * LRU_LIST_COUNT
+    for list_index in range(LRU_LIST_COUNT):
+        members = sorted((i for i, entry in enumerate(entries) if entry[2] == list_index), key=lambda i: -entries[i][1])
+        for position, i in enumerate(members):
+            entry_addr, rankings_addr = layout[i][0], layout[i][1]
+            following = layout[members[position + 1]][1] if position + 1 < len(members) else rankings_addr
+            used = to_chromium_time(entries[i][1])
+            struct.pack_into("<QQIIIiI", data_0, BLOCK_HEADER_SIZE + i * RANKINGS_NODE_SIZE,
+                             used, used, following, 0, entry_addr, 0, 0)
+        if members:
+            heads[list_index] = layout[members[0]][1]
+
+    index = bytearray(INDEX_HEADER_SIZE)
+    struct.pack_into("<IIi", index, 0, INDEX_MAGIC, INDEX_VERSION, len(entries))
+    struct.pack_into("<i", index, INDEX_TABLE_LEN_OFFSET, TABLE_LEN)
+    struct.pack_into(f"<{LRU_LIST_COUNT}I", index, LRU_HEADS_OFFSET, *heads)
+    index += struct.pack(f"<{TABLE_LEN}I", *table)
+
+    files = {"index": index, "data_0": data_0, "data_1": data_1,
+             "data_2": block_file(0, 1024), "data_3": block_file(0, 4096)}
+    for name, data in files.items():
+        with open(os.path.join(cache_dir, name), "wb") as f:
+            f.write(data)
+    return entries
+
+
+def expected_links(entries: List[Tuple[str, float, int]], limit: int) -> List[str]:
+    """살아 있는 가챠 항목의 링크를 마지막 사용 시각 최신순으로 (키의 마지막 https:// 부분)"""
+    live = [entry for entry in entries if entry[2] != DELETED_LIST and "GachaLog" in entry[0]]
+    live.sort(key=lambda entry: entry[1], reverse=True)
+    return ["https://" + key.rsplit("https://", 1)[1] for key, _, _ in live[:limit]]
+
+
+def clear_lru_heads(cache_dir: str) -> None:
+    """index의 LRU 리스트 head를 0으로 (비정상 종료로 랭킹이 기록되지 않은 캐시 흉내)"""
+    with open(os.path.join(cache_dir, "index"), "r+b") as f:
+        f.seek(LRU_HEADS_OFFSET)
+        f.write(bytes(4 * LRU_LIST_COUNT))
+
+
+class CountingParser(ChromiumCacheParser):
+    """읽은 블록 수를 세는 파서"""
+
+    def __init__(self, cache_dir: str):
+        super().__init__(cache_dir)
+        self.reads = 0
+
+    def read_block(self, addr: int) -> bytes:
+        self.reads += 1
+        return super().read_block(addr)
+
+
+def check(name: str, cache_dir: str, expected: List[str], limit: int) -> bool:
+    started = time.perf_counter()
+    urls = [entry["url"] for entry in find_gacha_entries(cache_dir, limit)]
+    elapsed = time.perf_counter() - started
+    ok = urls == expected
+    print(f"  {name:<28} {elapsed * 1000:8.1f}ms  {'✅' if ok else '❌ 결과 불일치'}")
+    if not ok:
+        for url in urls:
+            print(f"      결과: {url[:100]}")
+        for url in expected:
+            print(f"      기대: {url[:100]}")
+    return ok
+
+
+def main(args) -> None:
+    with tempfile.TemporaryDirectory() as cache_dir:
+        print(f"📝 합성 캐시 생성: 항목 {args.entries:,}개 (가챠 링크 비율 {args.gacha_ratio:.1%})")
+        entries = write_synthetic_cache(cache_dir, args.entries, args.gacha_ratio)
+        expected = expected_links(entries, args.limit)
+
+        with CountingParser(cache_dir) as parser:
+            parser.find_recent(lambda key: "GachaLog" in key, 1)
+            recent_reads = parser.reads
+            parser.reads = 0
+            total = sum(1 for _ in parser.iter_entries())
+            print(f"  최신 항목 1개 (LRU 리스트)   블록 {recent_reads:,}회 읽음")
+            print(f"  전체 항목 {total:,}개 (해시 테이블) 블록 {parser.reads:,}회 읽음")
+
+        results = [check("LRU 리스트", cache_dir, expected, args.limit)]
+        clear_lru_heads(cache_dir)
+        results.append(check("해시 테이블 (LRU head 없음)", cache_dir, expected, args.limit))
+
+    if not all(results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="웹캐시 파서 검증/벤치마크 (합성 Chromium blockfile 캐시)")
+    parser.add_argument("--entries", type=int, default=20000, help="캐시 항목 수")
+    parser.add_argument("--gacha-ratio", type=float, default=0.005, help="가챠 링크 항목 비율")
+    parser.add_argument("--limit", type=int, default=5, help="비교할 최신 링크 수")
+    main(parser.parse_args())
@@ -0,0 +1,150 @@
+"""가챠 조회 파이프라인 벤치마크 - 로컬 에뮬레이터를 상대로 '모든 배너 조회'와 같은 흐름을 실행
+
+사용 예:
+    python benchmark_fetch.py --pulls 2000 --latency 0.08 --rps 5 --burst 5
+    python benchmark_fetch.py --rate-limit-rps 4 --rps 10        # 서버 -110 주입
+    python benchmark_fetch.py --auth-expire-after 30             # 중간에 -101 주입
+    python benchmark_fetch.py --collab-pulls 100 --hedge         # 콜라보 엔드포인트 동시 요청
+    python benchmark_fetch.py --new-pulls 5 --archive-check      # 증분 조회 후 아카이브 재생 결과 검증
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import Dict, Optional
+
+from GachaAPI import GachaAPI
+from GachaAPIEmulator import GachaAPIEmulator
+from RateLimiter import RateLimiter
+from ApiCache import ApiCache
+from GachaErrors import GachaAPIError
+from PageArchive import PageArchive
+
+BANNER_IDS = ["11", "12", "21", "22", "1", "2"]
+
+
+async def run_sync_flow(gacha_url: str, rps: float, burst: int, api_cache: ApiCache,
+                        high_water: Optional[Dict[str, Dict[str, str]]] = None, hedge: bool = False,
+                        archive: Optional[PageArchive] = None) -> Dict:
+    """_fetch_all_banners_async와 같은 흐름: 링크 검증 → 6개 배너 동시 조회 (GUI 없이)"""
+    counts = {}
+    newest = {}
+    started = time.perf_counter()
+
+    async with GachaAPI(gacha_url, rate_limiter=RateLimiter(rps, burst), api_cache=api_cache, hedge_requests=hedge,
+                         archive=archive) as api:
+        if not await api.validate_link("ko"):
+            raise RuntimeError("링크 검증 실패")
+
+        async def fetch_one(banner_id: str):
+            counts[banner_id] = 0
+            try:
+                async for page in api.iter_pages(banner_id, "ko", high_water=(high_water or {}).get(banner_id)):
+                    counts[banner_id] += len(page)
+                    for record in page:
+                        marks = newest.setdefault(banner_id, {})
+                        if GachaAPI.record_id_value(record["id"]) > GachaAPI.record_id_value(marks.get(record["uid"])):
+                            marks[record["uid"]] = record["id"]
+            except GachaAPIError as e:
+                print(f"⚠️ 배너 {banner_id} 조회 중단 ({type(e).__name__}): {e}")
+
+        await asyncio.gather(*(fetch_one(banner_id) for banner_id in BANNER_IDS))
+        wall = time.perf_counter() - started
+
+        return {
+            "wall": wall,
+            "counts": counts,
+            "newest": newest,
+            "complete": all(api.fetch_status.get(b, {}).get("complete") for b in BANNER_IDS),
+            "requests": api.connection_stats["requests"],
+            "rate_limited_wait": api.rate_limiter.total_wait,
+            "connections": api.get_connection_summary(),
+            "pages": api.get_page_size_summary(),
+            "metrics": api.metrics.format_summary(),
+        }
+
+
+async def replay_archive_count(archive: PageArchive) -> int:
+    """아카이브만으로 모든 배너를 재생했을 때 나오는 기록 수 (PageArchive.py --out과 같은 경로)"""
+    api = GachaAPI(f"replay://archive/{GachaAPI.END_DEFAULT}", replay_archive=archive)
+    total = 0
+    for banner_id in BANNER_IDS:
+        async for page in api.iter_pages(banner_id, "ko"):
+            total += len(page)
+    return total
+
+
+def print_report(title: str, result: Dict, server_stats: Dict) -> None:
+    total = sum(result["counts"].values())
+    wall = result["wall"]
+    print(f"\n=== {title} ===")
+    print(f"벽시계 시간: {wall:.2f}초 | 요청 {result['requests']}회 ({result['requests'] / wall:.1f} req/s) | 기록 {total}개 ({total / wall:.0f} rec/s)")
+    print(f"배너별 기록: {result['counts']} | 완료: {result['complete']}")
+    print(f"속도 제한 대기: {result['rate_limited_wait']:.2f}초")
+    print(f"연결: {result['connections']}")
+    print(f"페이지: {result['pages']}")
+    print(f"계측: {result['metrics']}")
+    print(f"서버 통계: {server_stats}")
+
+
+async def main(args) -> None:
+    pulls = {"11": args.pulls, "12": args.pulls // 2, "21": args.collab_pulls, "22": 0, "1": args.pulls // 4, "2": 50}
+    emulator = GachaAPIEmulator(
+        pulls=pulls,
+        latency=args.latency,
+        latency_jitter=args.latency / 2,
+        rate_limit_rps=args.rate_limit_rps,
+        rate_limited_prob=args.rate_limited_prob,
+        auth_expire_after=args.auth_expire_after,
+        max_page_size=args.max_page_size,
+    )
+    gacha_url = await emulator.start()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        api_cache = ApiCache(os.path.join(temp_dir, "api_cache.json"))
+        archive = PageArchive(os.path.join(temp_dir, PageArchive.DEFAULT_PATH)) if args.archive_check else None
+        try:
+            full = await run_sync_flow(gacha_url, args.rps, args.burst, api_cache, hedge=args.hedge, archive=archive)
+            print_report("전체 조회", full, dict(emulator.stats))
+
+            expected = sum(pulls.values())
+            fetched = sum(full["counts"].values())
+            if fetched != expected:
+                print(f"⚠️ 기록 수 불일치: 기대 {expected}개, 실제 {fetched}개")
+
+            emulator.stats.update({key: 0 for key in emulator.stats})
+            if args.new_pulls:
+                emulator.add_pulls("11", args.new_pulls)
+            incremental = await run_sync_flow(gacha_url, args.rps, args.burst, api_cache, high_water=full["newest"],
+                                              hedge=args.hedge, archive=archive)
+            title = f"증분 조회 (새 기록 {args.new_pulls}개)" if args.new_pulls else "증분 조회 (변경 없음)"
+            print_report(title, incremental, dict(emulator.stats))
+        finally:
+            await emulator.stop()
+
+        if archive is not None:
+            archive.close()
+            expected = sum(emulator.pulls.values())
+            replayed = await replay_archive_count(archive)
+            if replayed != expected:
+                print(f"❌ 아카이브 재생 불일치: 기대 {expected}개, 재생 {replayed}개")
+                raise SystemExit(1)
+            print(f"✅ 아카이브 재생: {replayed}개 (전체 조회 + 증분 조회)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="가챠 조회 파이프라인 벤치마크 (로컬 에뮬레이터)")
+    parser.add_argument("--pulls", type=int, default=2000, help="한정 캐릭터 배너 기록 수 (다른 배너는 비율로 생성)")
+    parser.add_argument("--latency", type=float, default=0.05, help="서버 응답 지연(초)")
+    parser.add_argument("--rps", type=float, default=RateLimiter.DEFAULT_REQUESTS_PER_SECOND, help="클라이언트 초당 요청 수")
+    parser.add_argument("--burst", type=int, default=RateLimiter.DEFAULT_BURST, help="클라이언트 버스트 크기")
+    parser.add_argument("--rate-limit-rps", type=float, default=None, help="서버가 허용하는 초당 요청 수 (초과 시 -110)")
+    parser.add_argument("--rate-limited-prob", type=float, default=0.0, help="무작위 -110 주입 확률")
+    parser.add_argument("--auth-expire-after", type=int, default=None, help="요청 N회 이후 -101 주입")
+    parser.add_argument("--max-page-size", type=int, default=20, help="서버가 허용하는 최대 페이지 크기")
+    parser.add_argument("--collab-pulls", type=int, default=0, help="콜라보 캐릭터 배너 기록 수")
+    parser.add_argument("--hedge", action="store_true", help="콜라보 배너 첫 페이지를 두 엔드포인트에 동시에 요청")
+    parser.add_argument("--new-pulls", type=int, default=0, help="증분 조회 전에 한정 캐릭터 배너에 추가할 새 기록 수")
+    parser.add_argument("--archive-check", action="store_true", help="원본 페이지를 아카이브하고 증분 조회 후 재생 결과가 전체 기록과 같은지 확인")
+    asyncio.run(main(parser.parse_args()))
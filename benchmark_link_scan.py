@@ -0,0 +1,122 @@
+"""가챠 링크 추출 벤치마크 - 합성 Player.log(10MB~1GB)에서 링크 추출 방식별 시간/메모리 비교
+
+사용 예:
+    python benchmark_link_scan.py --sizes 10 100 1000
+    python benchmark_link_scan.py --sizes 1000 --skip-legacy      # 이전 방식(전체 읽기 + 정규식 7회)은 생략
+    python benchmark_link_scan.py --sizes 100 --link-at 0.1       # 마지막 링크가 파일 앞쪽 10% 지점에 있을 때
+"""
+import argparse
+import os
+import random
+import re
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, List, Optional, Tuple
+
+from GachaLinkFinder import GachaLinkFinder
+
+GACHA_URL = ("https://public-operation-hkrpg-sg.hoyoverse.com/common/gacha_record/api/getGachaLog"
+             "?authkey_ver=1&sign_type=2&lang=ko&game_biz=hkrpg_global&authkey={authkey}&gacha_type=11&page=1")
+
+NOISE_LINES = [
+    "[{n}] UnityEngine.Debug:Log(Object) Loading asset bundle {pad}",
+    "[Net] GET https://sg-public-data-api.hoyoverse.com/device-fp/api/getExtList?platform={n} 200",
+    "[{n}] Shader warning in 'Hidden/Post' : {pad}",
+]
+
+
+def legacy_extract(content: str) -> Optional[str]:
+    """이전 extract_gacha_patterns (정규식 6개 + 줄 단위 수동 검색) - 비교용"""
+    patterns = [
+        r'https://[^\s"\'<>\[\]{}|\\^`]*getGachaLog[^\s"\'<>\[\]{}|\\^`]*',
+        r'https://[^\s]*?public-operation-hkrpg[^\s]*?getGachaLog[^\s]*',
+        r'https://[^\s]*?hkrpg-api[^\s]*?getGachaLog[^\s]*',
+        r'https://[^\s]*?api-os-takumi[^\s]*?getGachaLog[^\s]*',
+        r'https://[^\s]*?hoyoverse[^\s]*?getGachaLog[^\s]*',
+        r'https://[^\s]*?mihoyo[^\s]*?getGachaLog[^\s]*'
+    ]
+    for pattern in patterns:
+        matches = re.findall(pattern, content, re.IGNORECASE)
+        if matches:
+            latest_link = matches[-1].strip('",\'()[]{}')
+            if latest_link and 'getGachaLog' in latest_link:
+                return latest_link
+    for line in content.split('\n'):
+        if 'getGachaLog' in line and 'https://' in line:
+            url_match = re.search(r'https://[^\s"\'<>\[\]{}|\\^`]*', line)
+            if url_match:
+                return url_match.group(0).strip('",\'()[]{}')
+    return None
+
+
+def write_synthetic_log(path: str, size_mb: int, links: int, link_at: float, seed: int = 1) -> str:
+    """size_mb 크기의 로그 생성 - 링크 links개를 link_at 비율 지점까지 고르게 흩뿌리고 마지막 링크를 반환"""
+    rng = random.Random(seed)
+    target = size_mb * 1024 * 1024
+    link_offsets = sorted(int(target * link_at * (i + 1) / links) for i in range(links))
+    latest = None
+    written = 0
+    n = 0
+
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        while written < target:
+            block = []
+            for _ in range(2000):
+                n += 1
+                block.append(rng.choice(NOISE_LINES).format(n=n, pad="x" * rng.randint(10, 200)))
+            text = "\n".join(block) + "\n"
+            while link_offsets and link_offsets[0] <= written + len(text):
+                link_offsets.pop(0)
+                latest = GACHA_URL.format(authkey=f"key{n}_{len(link_offsets)}")
+                text += f'[WebView] OnPageStarted url: "{latest}"\n'
+            f.write(text)
+            written += len(text)
+    return latest
+
+
+def measure(func: Callable[[], Optional[str]]) -> Tuple[Optional[str], float, float]:
+    """(결과, 소요 시간(초), 최대 메모리(MB))"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        result = func()
+    finally:
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def read_text(path: str) -> str:
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        return f.read()
+
+
+def main(args) -> None:
+    with tempfile.TemporaryDirectory() as workdir:
+        for size_mb in args.sizes:
+            path = os.path.join(workdir, f"Player_{size_mb}MB.log")
+            print(f"\n📝 합성 로그 생성: {size_mb}MB (링크 {args.links}개, 마지막 링크 위치 {args.link_at:.0%})")
+            expected = write_synthetic_log(path, size_mb, args.links, args.link_at)
+            actual_mb = os.path.getsize(path) / (1024 * 1024)
+
+            methods: List[Tuple[str, Callable[[], Optional[str]]]] = []
+            if not args.skip_legacy:
+                methods.append(("이전 방식 (전체 읽기 + 정규식 7회)", lambda: legacy_extract(read_text(path))))
+            methods.append(("단일 매처 (전체 읽기 + 1회)", lambda: GachaLinkFinder.extract_gacha_patterns(read_text(path))))
+            methods.append(("역방향 청크 스캔", lambda: GachaLinkFinder.find_last_gacha_link(path)))
+
+            for name, func in methods:
+                result, elapsed, peak = measure(func)
+                status = "✅" if result == expected else "❌ 결과 불일치"
+                print(f"  {name:<28} {elapsed:7.3f}초  {actual_mb / elapsed:8.1f} MB/s  최대 메모리 {peak:8.1f}MB  {status}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="가챠 링크 추출 벤치마크 (합성 Player.log)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100], help="생성할 로그 크기 목록 (MB, 예: 10 100 1000)")
+    parser.add_argument("--links", type=int, default=20, help="로그에 넣을 가챠 링크 수")
+    parser.add_argument("--link-at", type=float, default=0.9, help="마지막 링크 위치 (파일 크기 대비 비율, 0~1)")
+    parser.add_argument("--skip-legacy", action="store_true", help="이전 방식 측정 생략 (1GB에서 메모리 사용량이 큼)")
+    main(parser.parse_args())
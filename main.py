@@ -1,11 +1,11 @@
 import os
 import sys
-import threading
 import asyncio
 import tempfile
 import subprocess
 import webbrowser
 import warnings
+import time
 import customtkinter as ctk
 from tkinter import filedialog, messagebox  # messagebox 추가
 import json
@@ -17,9 +17,16 @@ import pandas as pd  # pandas가 설치되어 있다면 사용, 없으면 아래
 #자체 모듈
 from GachaLinkFinder import GachaLinkFinder
 from GachaAPI import GachaAPI
-from GachaLinkFinder import get_gacha_link_from_registry, get_gacha_link_from_logs
+from GachaLinkFinder import get_gacha_link_candidates_from_registry, get_gacha_link_candidates_from_log
 from ErrorHandler import ErrorHandler
-from CacheFileManager import get_gacha_link_from_game_cache
+from CacheFileManager import CacheFileManager, get_gacha_link_candidates_from_cache
+from LogScanState import LogScanState
+from RateLimiter import RateLimiter
+from LinkRegistry import LinkRegistry
+from PageArchive import PageArchive
+from SyncCheckpoint import SyncCheckpoint
+from GachaErrors import GachaAPIError, AuthExpiredError, error_from_result
+from BackgroundWorker import BackgroundWorker
 
 CURRENT_VERSION = "1.0.2"  # 실제 배포시 버전 문자열로 관리
 GITHUB_API = "https://api.github.com/repos/seunghoon4176/starrail-gacha-tracker/releases/latest"
@@ -90,10 +97,31 @@ class ModernGachaViewer:
         self.lang_var = ctk.StringVar(value="kr")     # 언어 변수 추가 (기본 kr)
         self.current_theme = "dark"  # 현재 테마 추적
         self.current_lang = "kr"     # 현재 언어 추적
+        # API 요청 속도 제한 (settings.json에서 조정 가능)
+        self.requests_per_second = RateLimiter.DEFAULT_REQUESTS_PER_SECOND
+        self.request_burst = RateLimiter.DEFAULT_BURST
+        # 최근 검증에 성공한 링크는 이 시간(초) 안에서 재검증 생략
+        self.link_revalidate_window = 300
+        self.link_registry = LinkRegistry()
+        # 조회 중 인증키가 만료되면 새 링크를 찾아 이어서 조회하는 최대 횟수
+        self.max_link_rediscovery = 2
+        # 받은 원본 페이지를 data.csv 옆 raw_pages.jsonl.gz에 쌓을지 여부
+        self.archive_raw_pages = False
+        # 콜라보 배너 첫 페이지를 두 엔드포인트에 동시에 요청 (왕복 1회로 엔드포인트 확인, 요청이 늘어나므로 기본은 끔)
+        self.hedge_collab_requests = False
+        # 백그라운드 자동 증분 조회 간격(분), 0이면 끔
+        self.auto_refresh_minutes = 0
         
         # 데이터 파일 초기화
         self.data_file = "gacha_records.json"
         
+        # 증분 조회 상태 (배너별 high-water mark: {banner_id: {uid: 최신 기록 id}})
+        self.sync_state_file = "sync_state.json"
+        self.sync_state = {"high_water": {}}
+        self.load_sync_state()
+        # 조회 도중 꺼져도 다음 실행에서 이어서 받도록 배너별 페이지 커서를 남김
+        self.sync_checkpoint = SyncCheckpoint()
+        
         # 설정 로드
         self.load_settings()
         
@@ -103,6 +131,13 @@ class ModernGachaViewer:
         # 초기 링크 상태 확인
         self.update_link_status()
         
+        # 조회/검증/메타데이터 갱신을 처리하는 백그라운드 루프 (앱이 켜져 있는 동안 유지)
+        self.worker = BackgroundWorker()
+        self.worker.start()
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.worker.submit("metadata", self._refresh_item_metadata)
+        self._apply_auto_refresh(run_now=True)
+        
         # self.check_update_on_startup()  # 자동 업데이트 체크
         # 메뉴바 생성
         self.create_menu_bar()
@@ -560,6 +595,18 @@ class ModernGachaViewer:
         )
         settings_btn.pack(side="left", padx=(0, 8))
 
+        # 링크 확인 버튼 - 조회 없이 링크가 살아 있는지만 확인
+        self.check_link_btn = ctk.CTkButton(
+            row_frame,
+            text="🔗 링크 확인",
+            command=self.check_link_status,
+            width=100,
+            height=32,
+            fg_color="gray50",
+            hover_color="gray40"
+        )
+        self.check_link_btn.pack(side="left", padx=(0, 8))
+
         # 프로그레스 바 (오른쪽, 남은 공간 모두 차지)
         self.progress_bar = ctk.CTkProgressBar(row_frame, height=14)
         self.progress_bar.pack(side="left", fill="x", expand=True, padx=(0, 8))
@@ -799,138 +846,306 @@ class ModernGachaViewer:
         self.root.update_idletasks()
     
     def fetch_all_banners(self):
-        """모든 배너 조회"""
+        """모든 배너 조회 - 백그라운드 작업자에 등록 (자동 갱신이 실행 중이면 그 조회를 기다림)"""
         # 조회 중에는 버튼 비활성화
         self.fetch_all_btn.configure(state="disabled")
-        def run_fetch():
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(self._fetch_all_banners_async())
-            loop.close()
-            # 조회 완료 후 버튼 다시 활성화 (메인스레드에서 실행)
-            self.root.after(0, lambda: self.fetch_all_btn.configure(state="normal"))
-        thread = threading.Thread(target=run_fetch, daemon=True)
-        thread.start()
+        future = self.worker.submit("sync", self._fetch_all_banners_async)
+        # 조회 완료 후 버튼 다시 활성화 (메인스레드에서 실행)
+        future.add_done_callback(lambda _: self.root.after(0, lambda: self.fetch_all_btn.configure(state="normal")))
+    
+    def _apply_auto_refresh(self, run_now: bool = False):
+        """설정된 간격으로 백그라운드 증분 조회 예약 (0이면 해제)"""
+        interval = max(0.0, float(self.auto_refresh_minutes)) * 60
+        self.worker.schedule("sync", interval, self._auto_refresh_sync)
+        if interval and run_now:
+            # 앱을 열자마자 최신 기록이 보이도록 바로 한 번 조회
+            self.worker.submit("sync", self._auto_refresh_sync)
+    
+    async def _auto_refresh_sync(self):
+        """자동 갱신용 조회 - 오류가 나도 대화상자를 띄우지 않고 상태 표시줄에만 표시"""
+        await self._fetch_all_banners_async(interactive=False)
     
-    async def _fetch_all_banners_async(self):
-        """비동기 모든 배너 조회 - 개선된 버전"""
+    def check_link_status(self):
+        """링크 확인 버튼 - 백그라운드 작업자에 링크 검증 등록 (사용자가 누를 때만 API에 접속)"""
+        self.check_link_btn.configure(state="disabled")
+        future = self.worker.submit("validate", self._check_link_status)
+        future.add_done_callback(lambda _: self.root.after(0, lambda: self.check_link_btn.configure(state="normal")))
+    
+    async def _check_link_status(self) -> bool:
+        """발견된 링크가 살아 있는지 확인해서 상태 표시줄에 표시"""
+        candidates = await self._find_gacha_links()
+        if not candidates:
+            self.update_progress(0, "ℹ️ 가챠 링크 없음 - 게임에서 워프 기록을 열어 주세요")
+            return False
+        async with GachaAPI(candidates[0], session=self.worker.session) as api:
+            try:
+                if len(candidates) > 1:
+                    await self._select_live_link(api, candidates, "ko")
+                await self._validate_gacha_link(api, "ko")
+            except GachaAPIError as e:
+                self.update_progress(0, f"⚠️ 가챠 링크 확인 실패: {e}")
+                return False
+        self.update_progress(0, "✅ 가챠 링크 사용 가능")
+        return True
+    
+    async def _refresh_item_metadata(self):
+        """캐릭터/광추 이름 데이터를 백그라운드에서 미리 받아 둠 (조회 중 GUI 스레드에서 내려받지 않도록)"""
+        sources = {
+            "_character_json_cache": "https://api.hakush.in/hsr/data/character.json",
+            "_lightcone_json_cache": "https://api.hakush.in/hsr/data/lightcone.json",
+        }
+        for attr, url in sources.items():
+            try:
+                async with self.worker.session.get(url, timeout=10) as resp:
+                    resp.raise_for_status()
+                    setattr(self, attr, await resp.json(content_type=None))
+            except Exception as e:
+                print(f"메타데이터 갱신 실패 ({url}): {e}")
+        self._item_name_cache = {}
+    
+    def _on_close(self):
+        """창 닫기 - 백그라운드 루프와 세션 정리"""
+        self.worker.stop()
+        self.root.destroy()
+    
+    def _show_fetch_error(self, title: str, message: str, interactive: bool):
+        """조회 오류 표시 - 자동 갱신 중에는 대화상자 없이 상태 표시줄에만"""
+        self.update_progress(0, message)
+        if interactive:
+            messagebox.showerror(title, message)
+    
+    async def _fetch_all_banners_async(self, interactive: bool = True):
+        """비동기 모든 배너 조회 - 개선된 버전 (interactive=False면 오류 대화상자를 띄우지 않음)"""
         try:
             self.update_progress(0, "🔄 연결 준비 중...")
             api_lang = "ko"  # kr에서 ko로 변경
             
-            # 가챠 링크 검색
-            gacha_link = await self._find_gacha_link()
-            if not gacha_link:
+            # 가챠 링크 후보 검색 (레지스트리/로그/캐시 전체, authkey 기준 중복 제거)
+            candidates = await self._find_gacha_links()
+            if not candidates:
                 error_msg = self.error_handler.get_detailed_error_message("가챠 링크 없음")
-                self.update_progress(0, error_msg)
-                messagebox.showerror("가챠 링크 오류", error_msg)
+                self._show_fetch_error("가챠 링크 오류", error_msg, interactive)
                 return
             
-            # 링크 검증
-            try:
-                await self._validate_gacha_link(gacha_link, api_lang)
-                self.update_progress(0.15, "✅ 가챠 링크 확인 완료")
-            except Exception as e:
-                error_msg = self.error_handler.get_detailed_error_message(str(e))
-                self.update_progress(0, error_msg)
-                messagebox.showerror("가챠 링크 오류", error_msg)
-                return
-            
-            # 배너별 조회
-            await self._fetch_banners_data(gacha_link, api_lang)
+            # 조회 한 번 동안 하나의 클라이언트(세션/커넥션 풀)를 공유
+            rate_limiter = RateLimiter(self.requests_per_second, self.request_burst)
+            archive = None
+            if self.archive_raw_pages:
+                archive = PageArchive(os.path.join(os.path.dirname(os.path.abspath("data.csv")), PageArchive.DEFAULT_PATH))
+            async with GachaAPI(candidates[0], rate_limiter=rate_limiter, archive=archive,
+                                hedge_requests=self.hedge_collab_requests, session=self.worker.session) as api:
+                for attempt in range(self.max_link_rediscovery + 1):
+                    try:
+                        # 후보가 여럿이면 동시에 검증해서 살아 있는 링크 선택
+                        if len(candidates) > 1:
+                            await self._select_live_link(api, candidates, api_lang)
+                        
+                        # 링크 검증
+                        await self._validate_gacha_link(api, api_lang)
+                        self.update_progress(0.15, "✅ 가챠 링크 확인 완료")
+                        
+                        # 배너별 조회
+                        await self._fetch_banners_data(api, api_lang)
+                        break
+                    except AuthExpiredError as e:
+                        # 만료된 키로 남은 페이지를 계속 넘기지 않고 바로 새 링크를 찾아 이어서 조회
+                        # (받아 둔 페이지는 체크포인트에 남아 있으므로 새 링크로 끊긴 위치부터 계속)
+                        print(f"⛔ 인증키 만료 - 새 링크 검색 ({attempt + 1}/{self.max_link_rediscovery}): {e}")
+                        self.link_registry.record_validation(api.gacha_url, False, LinkRegistry.AUTH_EXPIRED_RETCODE)
+                        candidates = await self._find_gacha_links() if attempt < self.max_link_rediscovery else []
+                        if not candidates:
+                            error_msg = self.error_handler.get_detailed_error_message(e)
+                            if api.fetch_status:
+                                # 만료 전에 끝까지 받은 배너는 저장 (끊긴 배너는 체크포인트에서 다음 조회 때 이어서 받음)
+                                completed = self._save_fetched_banners(api)
+                                error_msg += (f"\n\n끝까지 받은 배너 {completed}개는 저장했습니다. "
+                                              f"나머지 배너는 새 링크로 다음 조회에서 이어서 받습니다.")
+                            self._show_fetch_error("가챠 링크 오류", error_msg, interactive)
+                            return
+                        print(f"🔄 새 링크로 교체: {candidates[0][:80]}... (후보 {len(candidates)}개)")
+                        api.update_link(candidates[0])
+                    except GachaAPIError as e:
+                        error_msg = self.error_handler.get_detailed_error_message(e)
+                        self._show_fetch_error("가챠 링크 오류", error_msg, interactive)
+                        return
+                
+                if any(status.get("complete") for status in api.fetch_status.values()):
+                    self.link_registry.record_validation(api.gacha_url, True)
+                print(f"🔌 연결 통계: {api.get_connection_summary()}")
+                print(f"📏 페이지 통계: {api.get_page_size_summary()}")
+                print(f"📈 요청 계측: {api.metrics.format_summary()}")
+                self._write_fetch_metrics(api)
+                print(f"⏱️ 속도 제한 대기: 총 {rate_limiter.total_wait:.1f}초 ({rate_limiter.acquired}회 요청)")
             
             # 완료 처리
-            self.save_data_to_file()
-            self._update_summary_display()
+            self._save_fetched_banners(api)
             self.update_progress(1, "✅ 모든 배너 조회 완료!")
             
         except Exception as e:
             error_msg = str(e)
             print(f"❌ 전체 조회 실패: {error_msg}")
-            detailed_error = self.error_handler.get_detailed_error_message(error_msg)
-            self.update_progress(0, detailed_error)
-            messagebox.showerror("오류", detailed_error)
+            detailed_error = self.error_handler.get_detailed_error_message(e)
+            self._show_fetch_error("오류", detailed_error, interactive)
+    
+    def _save_fetched_banners(self, api: GachaAPI) -> int:
+        """받은 기록을 data.csv에 저장하고 끝까지 받은 배너의 체크포인트를 지움 - 끝까지 받은 배너 수 반환"""
+        self.save_data_to_file()
+        # data.csv에 저장된 뒤에야 끝까지 받은 배너의 체크포인트를 지움
+        completed = [banner_id for banner_id, status in api.fetch_status.items() if status.get("complete")]
+        for banner_id in completed:
+            self.sync_checkpoint.clear(banner_id)
+        self._update_summary_display()
+        return len(completed)
     
-    async def _find_gacha_link(self) -> Optional[str]:
-        """가챠 링크 검색"""
-        # 1. 레지스트리 검색
-        self.update_progress(0.05, "🔍 레지스트리 검색 중...")
-        link = get_gacha_link_from_registry()
-        if link:
-            return link
+    async def _find_gacha_links(self) -> List[str]:
+        """가챠 링크 후보 검색 - 레지스트리, 로그 파일별, 캐시 버전 폴더별 스캔을 스레드 풀에서 동시에 실행
+
+        후보는 링크의 timestamp(없으면 출처의 수정 시각) 기준 최신순으로 정렬하고,
+        authkey 기준으로 중복 제거, 만료로 확인된 링크는 제외
+        """
+        self.update_progress(0.05, "🔍 레지스트리/게임 로그/게임 캐시 동시 검색 중...")
+        started = time.perf_counter()
+        scan_state = LogScanState()
+
+        async def cache_candidates():
+            game_path = await asyncio.to_thread(CacheFileManager.find_game_path)
+            if not game_path:
+                print("❌ 게임 경로를 찾을 수 없습니다")
+                return []
+            cache_paths = await asyncio.to_thread(CacheFileManager.find_cache_paths, game_path)
+            results = await asyncio.gather(*(asyncio.to_thread(get_gacha_link_candidates_from_cache, path) for path in cache_paths))
+            return [candidate for result in results for candidate in result]
+
+        searches = [asyncio.to_thread(get_gacha_link_candidates_from_registry)]
+        searches += [asyncio.to_thread(get_gacha_link_candidates_from_log, path, scan_state) for path in GachaLinkFinder.get_log_paths()]
+        searches.append(cache_candidates())
+        results = await asyncio.gather(*searches, return_exceptions=True)
+        scan_state.save()
+
+        ranked = []
+        for result in results:
+            if isinstance(result, Exception):
+                print(f"⚠️ 링크 검색 실패: {result}")
+                continue
+            ranked.extend(result)
+        # 같은 시각이면 출처 순서(레지스트리 → 로그 → 캐시)와 출처 안의 최신순 유지
+        ranked.sort(key=lambda candidate: candidate[0], reverse=True)
+
+        candidates = []
+        for _, link in ranked:
+            if self.link_registry.is_known_expired(link):
+                print("⏭️ 만료된 링크 건너뜀")
+                continue
+            candidates.append(link)
+
+        candidates = GachaLinkFinder.unique_by_authkey(candidates)
+        print(f"🔗 가챠 링크 후보 {len(candidates)}개 ({time.perf_counter() - started:.2f}초)")
+        return candidates
+
+    async def _select_live_link(self, api: GachaAPI, candidates: List[str], api_lang: str):
+        """후보 링크를 동시에 검증해서 retcode 0을 먼저 돌려준 링크로 교체 - 모두 실패하면 해당 오류 발생
+
+        최근 link_revalidate_window 안에 검증에 성공한 후보가 있으면 네트워크 검증 없이 그 링크를 쓴다.
+        """
+        for candidate in candidates:
+            if self.link_registry.is_recently_valid(candidate, self.link_revalidate_window):
+                print(f"✅ 최근 검증된 링크 후보 사용 - 동시 확인 생략: {candidate[:80]}...")
+                if candidate != api.gacha_url:
+                    api.update_link(candidate)
+                return
         
-        # 2. 로그 파일 검색
-        self.update_progress(0.07, "🔍 게임 로그 검색 중...")
-        link = get_gacha_link_from_logs()
-        if link:
-            return link
+        self.update_progress(0.1, f"🔎 링크 후보 {len(candidates)}개 동시 확인 중...")
+        link = await api.select_live_link(candidates, api_lang)
         
-        # 3. 게임 캐시 검색
-        self.update_progress(0.08, "🔍 게임 캐시 검색 중...")
-        link = get_gacha_link_from_game_cache()
-        if link:
-            return link
+        # 확정된 결과(유효/-101/-111)는 다음 실행에서 바로 쓰도록 기록
+        for candidate, result in api.candidate_results.items():
+            retcode = api.determined_retcode(result)
+            if retcode is not None:
+                self.link_registry.record_validation(candidate, result["ok"], retcode)
         
-        return None
+        if not link:
+            results = [api.candidate_results[c] for c in candidates if c in api.candidate_results]
+            raise error_from_result(results[0] if results else None, api.VALIDATION_GACHA_TYPE, 1)
+        print(f"✅ 살아 있는 링크 선택: {link[:80]}...")
     
-    async def _validate_gacha_link(self, gacha_link: str, api_lang: str):
+    async def _validate_gacha_link(self, api: GachaAPI, api_lang: str):
         """가챠 링크 검증"""
-        print(f"링크 검증 시작: {gacha_link[:80]}...")
+        print(f"링크 검증 시작: {api.gacha_url[:80]}...")
+        self.link_registry.touch(api.gacha_url)
         
-        api = GachaAPI(gacha_link)
-        is_valid = await api.validate_link()
+        if self.link_registry.is_known_expired(api.gacha_url):
+            # 이전에 -101로 확인된 링크 - 네트워크 요청 없이 바로 거절
+            raise AuthExpiredError(
+                "인증키(authkey)가 만료된 링크입니다 (retcode -101, 이전 검증 결과).",
+                retcode=AuthExpiredError.RETCODE, reason="registry"
+            )
+        if api.validation_result and api.validation_result["ok"]:
+            print(f"✅ 이번 조회에서 이미 검증된 링크")
+            return
+        if self.link_registry.is_recently_valid(api.gacha_url, self.link_revalidate_window):
+            print(f"✅ 최근 {self.link_revalidate_window}초 안에 검증된 링크 - 재검증 생략")
+            return
+        
+        is_valid = await api.validate_link(api_lang)
+        retcode = api.determined_retcode(api.validation_result)
+        if retcode is not None:
+            self.link_registry.record_validation(api.gacha_url, is_valid, retcode)
         
         if not is_valid:
-            # retcode -101은 인증키 만료(유효기간 초과)임을 사용자에게 안내
-            message = (
-                "가챠 기록을 찾을 수 없습니다 - 게임에서 가챠 기록을 먼저 확인하세요.\n\n"
-                "또는 인증키(authkey)가 만료되었습니다.\n"
-                "게임을 실행한 후 워프(가챠) 기록을 한 번 열고 다시 시도하세요."
-            )
-            raise Exception(message)
+            # retcode별 예외 (-101 인증키 만료, -111 파라미터 오류, 네트워크 오류 등)
+            raise error_from_result(api.validation_result, api.VALIDATION_GACHA_TYPE, 1)
         
         print(f"✅ 검증 성공")
     
-    async def _fetch_banners_data(self, gacha_link: str, api_lang: str):
-        """배너별 데이터 조회 - 콜라보 배너 포함 전체 6개 배너 조회"""
-        # 전체 배너를 순서대로 조회 (콜라보 배너 포함)
+    async def _fetch_banners_data(self, api: GachaAPI, api_lang: str):
+        """배너별 데이터 조회 - 콜라보 배너 포함 전체 6개 배너를 동시에 조회"""
+        # 전체 배너를 동시에 조회 (요청 간격은 api의 공유 토큰 버킷이 조절)
         all_banner_ids = ["11", "12", "21", "22", "1", "2"]  # CHARACTER, LIGHT_CONE, 콜라보캐릭, 콜라보광추, STELLAR, DEPARTURE
+        completed = 0
         
-        for i, banner_id in enumerate(all_banner_ids):
+        async def fetch_one(banner_id: str):
+            nonlocal completed
             banner_name = self.banner_data[banner_id]["name"]
-            progress_value = 0.2 + (i * 0.12)  # 6개 배너에 맞게 진행률 조정
-            self.update_progress(progress_value, f"📊 {banner_name} 조회 중...")
             
             try:
                 print(f"\n🔍 === {banner_name} (타입 {banner_id}) 조회 시작 ===")
-                new_data = await self._fetch_banner_data(gacha_link, banner_id, api_lang)
-                new_items_added = self.merge_new_data(banner_id, new_data)
-                
-                self._calculate_banner_stats(banner_id)
-                self._update_banner_display(banner_id)
+                # 페이지가 도착할 때마다 병합/통계/화면 갱신까지 진행됨
+                new_items_added = await self._fetch_banner_data(api, banner_id, api_lang)
                 
                 total_items = len(self.banner_data[banner_id]["data"])
                 
-                if total_items > 0:
+                if not api.fetch_status.get(banner_id, {}).get("complete", True):
+                    status_msg = f"⚠️ {banner_name}: 일부만 조회됨 (+{new_items_added}개 신규)"
+                    print(f"⚠️ {banner_name} 조회가 중간에 끊김: {total_items}개 기록")
+                elif total_items > 0:
                     status_msg = f"✅ {banner_name}: {total_items}개 기록 (+{new_items_added}개 신규)"
                     print(f"✅ {banner_name} 조회 완료: {total_items}개 기록")
                 else:
                     status_msg = f"ℹ️ {banner_name}: 기록 없음"
                     print(f"ℹ️ {banner_name}: 기록 없음")
                     
-                self.update_progress(progress_value + 0.02, status_msg)
-                
-                # API 호출 간격을 늘려서 -110 오류 방지
-                await asyncio.sleep(1.5)
-                    
+            except AuthExpiredError:
+                raise
             except Exception as e:
                 print(f"❌ {banner_name} 조회 실패: {e}")
-                self.update_progress(progress_value + 0.02, f"❌ {banner_name}: 조회 실패")
-                continue
-
-    async def _fetch_banner_data(self, gacha_link: str, banner_id: str, api_lang: str) -> List[Any]:
-        """개별 배너 데이터 조회 - 콜라보 배너 포함 전체 배너 매핑"""
-        api = GachaAPI(gacha_link)
+                status_msg = f"❌ {banner_name}: 조회 실패"
+            
+            completed += 1
+            self.update_progress(0.2 + completed * (0.75 / len(all_banner_ids)), status_msg)
+        
+        self.update_progress(0.2, f"📊 배너 {len(all_banner_ids)}개 동시 조회 중...")
+        tasks = [asyncio.ensure_future(fetch_one(banner_id)) for banner_id in all_banner_ids]
+        try:
+            await asyncio.gather(*tasks)
+        except AuthExpiredError:
+            # 한 배너에서 인증키 만료가 확인되면 나머지 배너도 바로 중단
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    async def _fetch_banner_data(self, api: GachaAPI, banner_id: str, api_lang: str) -> int:
+        """개별 배너 데이터 조회 - 페이지를 받는 즉시 병합/통계/화면을 갱신하고 신규 기록 수 반환"""
         banner_type_map = {
             "11": "11",
             "12": "12",
@@ -940,22 +1155,93 @@ class ModernGachaViewer:
             "2": "2"
         }
         gacha_type = banner_type_map.get(banner_id, banner_id)
+        high_water = self._get_high_water(banner_id)
         print(f"🔍 배너 {banner_id} ({self.banner_data[banner_id]['name']}) -> gacha_type {gacha_type} 조회 시작")
-        records = await api.fetch_gacha_records(gacha_type, api_lang)
-        print(f"📊 배너 {banner_id}: {len(records)}개 기록 조회됨")
-        if records:
-            actual_gacha_type = records[0].get("gacha_type", "unknown")
-            first_item_name = records[0].get("name", "unknown")
-            first_item_rank = records[0].get("rank_type", "unknown")
-            print(f"✅ 실제 API 응답 - gacha_type: {actual_gacha_type}, 첫 아이템: {first_item_name} ({first_item_rank}성)")
+        if high_water:
+            print(f"⏩ 증분 조회: 저장된 최신 기록 {high_water} 이후만 조회")
+        
+        newest_ids = {}
+        
+        async def consume_pages(lang: str, high_water=None, resume=None, expected_uid: str = ""):
+            """페이지 스트림을 받아 바로 병합하고 체크포인트에 남긴 뒤 (받은 기록 수, 신규 기록 수, uid 일치 여부) 반환"""
+            fetched = 0
+            added = 0
+            try:
+                async for page in api.iter_pages(gacha_type, lang, high_water=high_water, resume=resume):
+                    if expected_uid and str(page[0].get("uid", "")) != expected_uid:
+                        # 다른 계정의 링크로 바뀌었으면 이전 커서는 의미가 없음
+                        return fetched, added, False
+                    if not fetched:
+                        print(f"✅ 실제 API 응답 - gacha_type: {page[0].get('gacha_type', 'unknown')}, 첫 아이템: {page[0].get('name', 'unknown')} ({page[0].get('rank_type', 'unknown')}성)")
+                    fetched += len(page)
+                    self.sync_checkpoint.append(banner_id, api.cursors.get(gacha_type, {}), page, lang)
+                    self._collect_newest_ids(page, newest_ids)
+                    added += self.merge_new_data(banner_id, self._convert_records(page))
+                    self._calculate_banner_stats(banner_id)
+                    self._update_banner_display(banner_id)
+            except AuthExpiredError:
+                raise
+            except GachaAPIError as e:
+                # 일시적인 오류는 받은 만큼만 반영 (fetch_status와 체크포인트가 끊긴 위치를 기억)
+                print(f"⚠️ 배너 {banner_id} 조회 중단: {e}")
+            return fetched, added, True
+        
+        checkpoint = self.sync_checkpoint.load(banner_id)
+        if checkpoint:
+            # 지난번에 끊긴 조회: 받아 둔 기록을 먼저 반영하고 남은 구간만 이어서 조회
+            print(f"♻️ 배너 {banner_id}: 체크포인트에서 이어서 조회 ({len(checkpoint['records'])}개 기록, 페이지 {checkpoint['cursor'].get('page')}부터)")
+            restored = checkpoint["records"]
+            fetched, added, same_account = await consume_pages(checkpoint["lang"], high_water, checkpoint["cursor"], checkpoint["uid"])
+            if same_account:
+                added += self.merge_new_data(banner_id, self._convert_records(restored))
+                self._collect_newest_ids(restored, newest_ids)
+                self._calculate_banner_stats(banner_id)
+                self._update_banner_display(banner_id)
+                if api.fetch_status.get(gacha_type, {}).get("complete"):
+                    # 끊긴 뒤에 새로 뽑은 기록은 커서보다 위에 있으므로 맨 앞 페이지부터 한 번 더 (보통 요청 1회)
+                    head_fetched, head_added, _ = await consume_pages(api_lang, {**(high_water or {}), **newest_ids})
+                    fetched += head_fetched
+                    added += head_added
+            else:
+                print(f"⚠️ 배너 {banner_id}: 체크포인트의 계정과 현재 링크의 계정이 달라 처음부터 조회")
+                self.sync_checkpoint.clear(banner_id)
+                newest_ids.clear()
+                checkpoint = None
+        if not checkpoint:
+            fetched, added, _ = await consume_pages(api_lang, high_water)
+        print(f"📊 배너 {banner_id}: {fetched}개 기록 조회됨")
+        if not checkpoint and not fetched and api_lang != "en" and not api.fetch_status.get(gacha_type, {}).get("complete"):
+            # 정상적으로 비어 있는 배너는 재시도하지 않음 - 오류로 끝난 경우만 'en' 1건 요청으로 먼저 확인
+            # (이름은 나중에 item id로 찾으므로 요청 언어는 결과에 거의 영향 없음)
+            print(f"🔄 오류로 끝나 'en'으로 기록 존재 여부 확인...")
+            if await api.has_records(gacha_type, "en"):
+                fetched, added, _ = await consume_pages("en", high_water)
+                print(f"📊 영어로 재시도 결과: {fetched}개 기록")
+        
+        # 중간에 끊긴 조회로 mark를 올리면 빠진 구간이 영영 채워지지 않으므로 완료된 경우에만 갱신
+        # (끊긴 경우는 체크포인트가 남아 다음 실행에서 이어서 조회)
+        fetch_status = api.fetch_status.get(gacha_type, {})
+        if fetch_status.get("complete"):
+            self._update_high_water(banner_id, newest_ids)
         else:
-            # 빈 결과도 시도해보기 위해 다른 언어로 재시도
-            if api_lang != "en":
-                print(f"🔄 언어를 'en'으로 변경하여 재시도...")
-                records = await api.fetch_gacha_records(gacha_type, "en")
-                print(f"📊 영어로 재시도 결과: {len(records)}개 기록")
+            print(f"⚠️ 배너 {banner_id}: 기록 일부만 조회됨 ({fetch_status.get('reason')}, 페이지 {fetch_status.get('page')})")
         
-        # 레코드를 객체로 변환
+        return added
+
+    def _write_fetch_metrics(self, api: GachaAPI):
+        """요청별 계측 결과를 data.csv 옆 fetch_metrics.json으로 저장"""
+        try:
+            metrics_path = os.path.join(os.path.dirname(os.path.abspath("data.csv")), "fetch_metrics.json")
+            api.metrics.write_json(metrics_path, extra={
+                "connections": api.connection_stats,
+                "pages": api.page_stats,
+                "fetch_status": api.fetch_status,
+            })
+        except Exception as e:
+            print(f"계측 결과 저장 중 오류: {e}")
+
+    def _convert_records(self, records: List[dict]) -> List[Any]:
+        """API 원본 기록을 GachaItem 객체로 변환"""
         converted_records = []
         for record in records:
             item_obj = type('GachaItem', (), {})()
@@ -966,6 +1252,7 @@ class ModernGachaViewer:
                 or record.get("id")
                 or ""
             )
+            item_obj.record_id = record.get("id", "")
             item_obj.name = record.get("name", "")
             item_obj.rank = int(record.get("rank_type", "3"))
             item_obj.time = record.get("time", "")
@@ -976,6 +1263,52 @@ class ModernGachaViewer:
         
         return converted_records
 
+    def _get_high_water(self, banner_id: str) -> dict:
+        """배너의 high-water mark 중 현재 데이터에 실제로 남아 있는 uid만 반환"""
+        marks = self.sync_state.get("high_water", {}).get(banner_id, {})
+        stored_uids = {str(getattr(item, "uid", "")) for item in self.banner_data[banner_id]["data"]}
+        return {uid: record_id for uid, record_id in marks.items() if uid in stored_uids}
+
+    @staticmethod
+    def _collect_newest_ids(records: List[dict], newest_ids: dict):
+        """원본 기록에서 uid별 가장 최신 기록 id를 newest_ids에 누적"""
+        for record in records:
+            uid = str(record.get("uid", ""))
+            record_id = record.get("id")
+            if not uid or not record_id:
+                continue
+            if GachaAPI.record_id_value(record_id) > GachaAPI.record_id_value(newest_ids.get(uid)):
+                newest_ids[uid] = str(record_id)
+
+    def _update_high_water(self, banner_id: str, newest_ids: dict):
+        """uid별 최신 기록 id로 high-water mark 갱신"""
+        if not newest_ids:
+            return
+        marks = self.sync_state.setdefault("high_water", {}).setdefault(banner_id, {})
+        for uid, record_id in newest_ids.items():
+            if GachaAPI.record_id_value(record_id) > GachaAPI.record_id_value(marks.get(uid)):
+                marks[uid] = record_id
+        self.save_sync_state()
+
+    def load_sync_state(self):
+        """증분 조회 상태를 파일에서 로드"""
+        try:
+            if os.path.exists(self.sync_state_file):
+                with open(self.sync_state_file, "r", encoding="utf-8") as f:
+                    self.sync_state = json.load(f)
+                self.sync_state.setdefault("high_water", {})
+        except Exception as e:
+            print(f"증분 조회 상태 로드 중 오류: {e}")
+            self.sync_state = {"high_water": {}}
+
+    def save_sync_state(self):
+        """증분 조회 상태를 파일에 저장"""
+        try:
+            with open(self.sync_state_file, "w", encoding="utf-8") as f:
+                json.dump(self.sync_state, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            print(f"증분 조회 상태 저장 중 오류: {e}")
+
     def _calculate_banner_stats(self, banner_id):
         """배너 통계 계산"""
         data = self.banner_data[banner_id]["data"]
@@ -1392,7 +1725,13 @@ class ModernGachaViewer:
         try:
             settings = {
                 "theme": self.current_theme,
-                "lang": self.lang_var.get()
+                "lang": self.lang_var.get(),
+                "requests_per_second": self.requests_per_second,
+                "request_burst": self.request_burst,
+                "link_revalidate_window": self.link_revalidate_window,
+                "archive_raw_pages": self.archive_raw_pages,
+                "hedge_collab_requests": self.hedge_collab_requests,
+                "auto_refresh_minutes": self.auto_refresh_minutes
             }
             with open("settings.json", "w", encoding="utf-8") as f:
                 json.dump(settings, f, ensure_ascii=False, indent=2)
@@ -1412,6 +1751,12 @@ class ModernGachaViewer:
                     ctk.set_appearance_mode(saved_theme)
                     self.current_lang = saved_lang
                     self.lang_var.set(saved_lang)
+                    self.requests_per_second = float(settings.get("requests_per_second", self.requests_per_second))
+                    self.request_burst = int(settings.get("request_burst", self.request_burst))
+                    self.link_revalidate_window = float(settings.get("link_revalidate_window", self.link_revalidate_window))
+                    self.archive_raw_pages = bool(settings.get("archive_raw_pages", self.archive_raw_pages))
+                    self.hedge_collab_requests = bool(settings.get("hedge_collab_requests", self.hedge_collab_requests))
+                    self.auto_refresh_minutes = float(settings.get("auto_refresh_minutes", self.auto_refresh_minutes))
             else:
                 self.current_theme = "dark"
                 self.theme_var.set("dark")